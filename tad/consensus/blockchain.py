@@ -74,6 +74,8 @@ class Blockchain(BlockchainInterface):
     # All sub-epoch summaries that have been included in the blockchain from the beginning until and including the peak
     # (height_included, SubEpochSummary). Note: ONLY for the blocks in the path to the peak
     __sub_epoch_summaries: Dict[uint32, SubEpochSummary] = {}
+    # Sorted keys of __sub_epoch_summaries, rebuilt lazily after the summaries change
+    _ses_heights: Optional[List[uint32]]
     # Unspent Store
     coin_store: CoinStore
     # Store
@@ -134,6 +136,7 @@ class Blockchain(BlockchainInterface):
         height_to_hash, sub_epoch_summaries = await self.block_store.get_peak_height_dicts()
         self.__height_to_hash = height_to_hash
         self.__sub_epoch_summaries = sub_epoch_summaries
+        self._ses_heights = None
         self.__block_records = {}
         self.__heights_in_cache = {}
         block_records, peak = await self.block_store.get_block_records_close_to_peak(self.constants.BLOCKS_CACHE_SIZE)
@@ -285,6 +288,7 @@ class Blockchain(BlockchainInterface):
                         self.__sub_epoch_summaries[
                             fetched_block_record.height
                         ] = fetched_block_record.sub_epoch_summary_included
+                        self._ses_heights = None
                 if peak_height is not None:
                     self._peak_height = peak_height
             except BaseException:
@@ -382,6 +386,7 @@ class Blockchain(BlockchainInterface):
             for height in heights_to_delete:
                 log.info(f"delete ses at height {height}")
                 del self.__sub_epoch_summaries[height]
+                self._ses_heights = None
 
             # Collect all blocks from fork point to new peak
             blocks_to_add: List[Tuple[FullBlock, BlockRecord]] = []
@@ -674,7 +679,13 @@ class Blockchain(BlockchainInterface):
         return self.block_record(header_hash)
 
     def get_ses_heights(self) -> List[uint32]:
-        return sorted(self.__sub_epoch_summaries.keys())
+        """
+        Returns the sorted heights of the sub-epoch summaries in the path to the peak. The list is cached, so
+        callers must not modify it.
+        """
+        if self._ses_heights is None:
+            self._ses_heights = sorted(self.__sub_epoch_summaries.keys())
+        return self._ses_heights
 
     def get_ses(self, height: uint32) -> SubEpochSummary:
         return self.__sub_epoch_summaries[height]
@@ -682,6 +693,17 @@ class Blockchain(BlockchainInterface):
     def height_to_hash(self, height: uint32) -> Optional[bytes32]:
         return self.__height_to_hash[height]
 
+    def height_to_hash_range(self, start: uint32, end: uint32) -> Optional[List[bytes32]]:
+        """
+        Returns the header hashes of the blocks in the path to the peak from start to end (inclusive), or None if any
+        of these heights is not in the blockchain.
+        """
+        height_to_hash = self.__height_to_hash
+        try:
+            return [height_to_hash[height] for height in range(start, end + 1)]
+        except KeyError:
+            return None
+
     def contains_height(self, height: uint32) -> bool:
         return height in self.__height_to_hash
 
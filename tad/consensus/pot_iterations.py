@@ -4,6 +4,9 @@ from tad.types.blockchain_format.sized_bytes import bytes32
 from tad.util.hash import std_hash
 from tad.util.ints import uint8, uint64, uint128
 
+# The quality hash is a 256 bit number, this scales it to a random number between 0 and 1
+QUALITY_HASH_RANGE = 2 ** 256
+
 
 def is_overflow_block(constants: ConsensusConstants, signage_point_index: uint8) -> bool:
     if signage_point_index >= constants.NUM_SPS_SUB_SLOT:
@@ -60,6 +63,6 @@ def calculate_iterations_quality(
         int(difficulty)
         * int(difficulty_constant_factor)
         * int.from_bytes(sp_quality_string, "big", signed=False)
-        // (int(pow(2, 256)) * int(_expected_plot_size(size)))
+        // (QUALITY_HASH_RANGE * int(_expected_plot_size(size)))
     )
     return max(iters, uint64(1))
@@ -171,6 +171,25 @@ class BlockStore:
         await cursor.close()
         return [FullBlock.from_bytes(row[0]) for row in rows]
 
+    async def get_full_blocks_in_range(self, start: uint32, stop: uint32) -> Dict[bytes32, FullBlock]:
+        """
+        Returns a dictionary with all full blocks with height between start and stop (inclusive), if present.
+        This includes orphaned blocks, so callers should pick the main chain ones by header hash.
+        """
+
+        cursor = await self.db.execute(
+            "SELECT header_hash, block from full_blocks WHERE height >= ? and height <= ?", (start, stop)
+        )
+        rows = await cursor.fetchall()
+        await cursor.close()
+        ret: Dict[bytes32, FullBlock] = {}
+        for row in rows:
+            header_hash = bytes.fromhex(row[0])
+            full_block: FullBlock = FullBlock.from_bytes(row[1])
+            ret[header_hash] = full_block
+            self.block_cache.put(header_hash, full_block)
+        return ret
+
     async def get_block_records_by_hash(self, header_hashes: List[bytes32]):
         """
         Returns a list of Block Records, ordered by the same order in which header_hashes are passed in.
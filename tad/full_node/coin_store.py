@@ -1,4 +1,4 @@
-from typing import List, Optional, Set, Dict
+from typing import List, Optional, Set, Dict, Tuple
 import aiosqlite
 from tad.protocols.wallet_protocol import CoinState
 from tad.types.blockchain_format.coin import Coin
@@ -138,9 +138,9 @@ class CoinStore:
         return None
 
     async def get_coins_added_at_height(self, height: uint32) -> List[CoinRecord]:
-        cursor = await self.coin_record_db.execute("SELECT * from coin_record WHERE confirmed_index=?", (height,))
-        rows = await cursor.fetchall()
-        await cursor.close()
+        rows = await self.coin_record_db.execute_fetchall(
+            "SELECT * from coin_record WHERE confirmed_index=?", (height,)
+        )
         coins = []
         for row in rows:
             coin = Coin(bytes32(bytes.fromhex(row[6])), bytes32(bytes.fromhex(row[5])), uint64.from_bytes(row[7]))
@@ -151,9 +151,7 @@ class CoinStore:
         # Special case to avoid querying all unspent coins (spent_index=0)
         if height == 0:
             return []
-        cursor = await self.coin_record_db.execute("SELECT * from coin_record WHERE spent_index=?", (height,))
-        rows = await cursor.fetchall()
-        await cursor.close()
+        rows = await self.coin_record_db.execute_fetchall("SELECT * from coin_record WHERE spent_index=?", (height,))
         coins = []
         for row in rows:
             spent: bool = bool(row[3])
@@ -163,6 +161,57 @@ class CoinStore:
                 coins.append(coin_record)
         return coins
 
+    async def get_removed_coins_by_name_at_height(self, height: uint32) -> Dict[bytes32, Coin]:
+        """
+        Returns the coins spent at the given height, keyed by coin name. The names come straight from the primary key,
+        so no coin is hashed.
+        """
+        # Special case to avoid querying all unspent coins (spent_index=0)
+        if height == 0:
+            return {}
+        rows = await self.coin_record_db.execute_fetchall(
+            "SELECT coin_name, coin_parent, puzzle_hash, amount from coin_record WHERE spent_index=? AND spent=1",
+            (height,),
+        )
+        return {
+            bytes32(bytes.fromhex(row[0])): Coin(
+                bytes32(bytes.fromhex(row[1])), bytes32(bytes.fromhex(row[2])), uint64.from_bytes(row[3])
+            )
+            for row in rows
+        }
+
+    async def get_added_coins_in_range(self, start_height: uint32, end_height: uint32) -> List[Tuple[uint32, Coin]]:
+        """
+        Returns (height, coin) for the non-coinbase coins added at any height between start_height and end_height
+        (inclusive). Only the coin columns are read, no CoinRecords are built.
+        """
+        rows = await self.coin_record_db.execute_fetchall(
+            "SELECT confirmed_index, coin_parent, puzzle_hash, amount from coin_record "
+            "WHERE confirmed_index>=? AND confirmed_index<=? AND coinbase=0",
+            (start_height, end_height),
+        )
+        return [
+            (row[0], Coin(bytes32(bytes.fromhex(row[1])), bytes32(bytes.fromhex(row[2])), uint64.from_bytes(row[3])))
+            for row in rows
+        ]
+
+    async def get_removed_coin_names_in_range(
+        self, start_height: uint32, end_height: uint32
+    ) -> List[Tuple[uint32, bytes32]]:
+        """
+        Returns (height, coin name) for the coins spent at any height between start_height and end_height
+        (inclusive). The names come straight from the primary key, so no coin is hashed.
+        """
+        # Special case to avoid querying all unspent coins (spent_index=0)
+        start_height = uint32(max(start_height, 1))
+        if end_height < start_height:
+            return []
+        rows = await self.coin_record_db.execute_fetchall(
+            "SELECT spent_index, coin_name from coin_record WHERE spent_index>=? AND spent_index<=? AND spent=1",
+            (start_height, end_height),
+        )
+        return [(row[0], bytes32(bytes.fromhex(row[1]))) for row in rows]
+
     # Checks DB and DiffStores for CoinRecords with puzzle_hash and returns them
     async def get_coin_records_by_puzzle_hash(
         self,
@@ -261,16 +310,12 @@ class CoinStore:
 
         coins = set()
         puzzle_hashes_db = tuple([ph.hex() for ph in puzzle_hashes])
-        cursor = await self.coin_record_db.execute(
+        rows = await self.coin_record_db.execute_fetchall(
             f'SELECT * from coin_record WHERE puzzle_hash in ({"?," * (len(puzzle_hashes_db) - 1)}?) '
             f"AND confirmed_index>=? AND confirmed_index<? "
             f"{'' if include_spent_coins else 'AND spent=0'}",
             puzzle_hashes_db + (start_height, end_height),
         )
-
-        rows = await cursor.fetchall()
-
-        await cursor.close()
         for row in rows:
             coins.add(self.row_to_coin_state(row))
 
@@ -288,16 +333,12 @@ class CoinStore:
 
         coins = set()
         parent_ids_db = tuple([pid.hex() for pid in parent_ids])
-        cursor = await self.coin_record_db.execute(
+        rows = await self.coin_record_db.execute_fetchall(
             f'SELECT * from coin_record WHERE coin_parent in ({"?," * (len(parent_ids_db) - 1)}?) '
             f"AND confirmed_index>=? AND confirmed_index<? "
             f"{'' if include_spent_coins else 'AND spent=0'}",
             parent_ids_db + (start_height, end_height),
         )
-
-        rows = await cursor.fetchall()
-
-        await cursor.close()
         for row in rows:
             coin = Coin(bytes32(bytes.fromhex(row[6])), bytes32(bytes.fromhex(row[5])), uint64.from_bytes(row[7]))
             coins.add(CoinRecord(coin, row[1], row[2], row[3], row[4], row[8]))
@@ -315,20 +356,44 @@ class CoinStore:
 
         coins = set()
         parent_ids_db = tuple([pid.hex() for pid in coin_ids])
-        cursor = await self.coin_record_db.execute(
+        rows = await self.coin_record_db.execute_fetchall(
             f'SELECT * from coin_record WHERE coin_name in ({"?," * (len(parent_ids_db) - 1)}?) '
             f"AND confirmed_index>=? AND confirmed_index<? "
             f"{'' if include_spent_coins else 'AND spent=0'}",
             parent_ids_db + (start_height, end_height),
         )
-
-        rows = await cursor.fetchall()
-
-        await cursor.close()
         for row in rows:
             coins.add(self.row_to_coin_state(row))
         return list(coins)
 
+    async def get_coin_states_by_hints(
+        self,
+        include_spent_coins: bool,
+        hints: List[bytes],
+        start_height: uint32 = uint32(0),
+        end_height: uint32 = uint32((2 ** 32) - 1),
+        batch_size: int = 900,
+    ) -> List[CoinState]:
+        """
+        Returns the states of the coins hinted to any of the given hints, joining the hints table (see HintStore)
+        so that the coin ids are never loaded into python.
+        """
+        assert batch_size < 999
+        coins = set()
+        for i in range(0, len(hints), batch_size):
+            hints_db = tuple(hints[i : i + batch_size])
+            rows = await self.coin_record_db.execute_fetchall(
+                f"SELECT coin_record.* from hints INNER JOIN coin_record "
+                f"ON coin_record.coin_name=lower(hex(hints.coin_id)) "
+                f'WHERE hints.hint in ({"?," * (len(hints_db) - 1)}?) '
+                f"AND coin_record.confirmed_index>=? AND coin_record.confirmed_index<? "
+                f"{'' if include_spent_coins else 'AND coin_record.spent=0'}",
+                hints_db + (start_height, end_height),
+            )
+            for row in rows:
+                coins.add(self.row_to_coin_state(row))
+        return list(coins)
+
     async def rollback_to_block(self, block_index: int) -> List[CoinRecord]:
         """
         Note that block_index can be negative, in which case everything is rolled back
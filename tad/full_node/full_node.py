@@ -58,6 +58,7 @@ from tad.util.check_fork_next_block import check_fork_next_block
 from tad.util.db_wrapper import DBWrapper
 from tad.util.errors import ConsensusError, Err
 from tad.util.ints import uint8, uint32, uint64, uint128
+from tad.util.lru_cache import LRUCache
 from tad.util.path import mkdir, path_from_root
 from tad.util.safe_cancel_task import cancel_task_safe
 from tad.util.profiler import profile_task
@@ -107,7 +108,10 @@ class FullNode:
         self.signage_point_times = [time.time() for _ in range(self.constants.NUM_SPS_SUB_SLOT)]
         self.full_node_store = FullNodeStore(self.constants)
         self.uncompact_task = None
-        self.compact_vdf_requests: Set[bytes32] = set()
+        self.compact_vdf_requests: Set[full_node_protocol.NewCompactVDF] = set()
+        # Header hash : HeaderBlock, served to wallets. Only filled when the chain did not change while the block's
+        # coins were fetched by height, see request_header_blocks.
+        self.header_block_cache: LRUCache = LRUCache(10000)
         self.log = logging.getLogger(name if name else __name__)
 
         self._ui_tasks = set()
@@ -127,6 +131,7 @@ class FullNode:
     async def _start(self):
         self.timelord_lock = asyncio.Lock()
         self.compact_vdf_sem = asyncio.Semaphore(4)
+        self.compact_vdf_pending = 0  # Number of new_compact_vdf requests waiting for or holding compact_vdf_sem
         self.new_peak_sem = asyncio.Semaphore(8)
         # create the store (db) and full node instance
         self.connection = await aiosqlite.connect(self.db_path)
@@ -575,23 +580,23 @@ class FullNode:
 
     def remove_subscriptions(self, peer: ws.WSTadConnection):
         # Remove all ph | coin id subscription for this peer
+        # Hashes without subscribed peers left are dropped, so the maps only hold live subscriptions
         node_id = peer.peer_node_id
-        if node_id in self.peer_puzzle_hash:
-            puzzle_hashes = self.peer_puzzle_hash[node_id]
-            for ph in puzzle_hashes:
-                if ph in self.ph_subscriptions:
-                    if node_id in self.ph_subscriptions[ph]:
-                        self.ph_subscriptions[ph].remove(node_id)
-
-        if node_id in self.peer_coin_ids:
-            coin_ids = self.peer_coin_ids[node_id]
-            for coin_id in coin_ids:
-                if coin_id in self.coin_subscriptions:
-                    if node_id in self.coin_subscriptions[coin_id]:
-                        self.coin_subscriptions[coin_id].remove(node_id)
-
-        if peer.peer_node_id in self.peer_sub_counter:
-            self.peer_sub_counter.pop(peer.peer_node_id)
+        for ph in self.peer_puzzle_hash.pop(node_id, set()):
+            ph_peers = self.ph_subscriptions.get(ph)
+            if ph_peers is not None:
+                ph_peers.discard(node_id)
+                if len(ph_peers) == 0:
+                    self.ph_subscriptions.pop(ph)
+
+        for coin_id in self.peer_coin_ids.pop(node_id, set()):
+            coin_peers = self.coin_subscriptions.get(coin_id)
+            if coin_peers is not None:
+                coin_peers.discard(node_id)
+                if len(coin_peers) == 0:
+                    self.coin_subscriptions.pop(coin_id)
+
+        self.peer_sub_counter.pop(node_id, None)
 
     def _num_needed_peers(self) -> int:
         assert self.server is not None
@@ -1,4 +1,5 @@
 import asyncio
+import bisect
 import dataclasses
 import time
 import traceback
@@ -36,6 +37,7 @@ from tad.types.coin_record import CoinRecord
 from tad.types.end_of_slot_bundle import EndOfSubSlotBundle
 from tad.types.full_block import FullBlock
 from tad.types.generator_types import BlockGenerator
+from tad.types.header_block import HeaderBlock
 from tad.types.mempool_inclusion_status import MempoolInclusionStatus
 from tad.types.mempool_item import MempoolItem
 from tad.types.peer_info import PeerInfo
@@ -46,6 +48,13 @@ from tad.util.hash import std_hash
 from tad.util.ints import uint8, uint32, uint64, uint128
 from tad.util.merkle_set import MerkleSet
 
+# A block can create at most MAX_BLOCK_COST_CLVM // CREATE_COIN cost (~6100) coins, so honest additions and removals
+# requests never come close to these. They bound the MerkleSet and response we build for a single wallet request.
+MAX_COINS_PER_RESPONSE = 10000
+MAX_NAMES_PER_REQUEST = 10000
+
+ZERO32: bytes32 = bytes32(b"\x00" * 32)
+
 
 class FullNodeAPI:
     full_node: FullNode
@@ -898,7 +907,7 @@ class FullNodeAPI:
             if unfinished_block.is_transaction_block():
                 foliage_transaction_block_hash = unfinished_block.foliage.foliage_transaction_block_hash
             else:
-                foliage_transaction_block_hash = bytes([0] * 32)
+                foliage_transaction_block_hash = ZERO32
 
             message = farmer_protocol.RequestSignedValues(
                 quality_string,
@@ -969,11 +978,12 @@ class FullNodeAPI:
         fsb2 = dataclasses.replace(
             candidate.foliage,
             foliage_block_data_signature=farmer_request.foliage_block_data_signature,
+            foliage_transaction_block_signature=(
+                farmer_request.foliage_transaction_block_signature
+                if candidate.is_transaction_block()
+                else candidate.foliage.foliage_transaction_block_signature
+            ),
         )
-        if candidate.is_transaction_block():
-            fsb2 = dataclasses.replace(
-                fsb2, foliage_transaction_block_signature=farmer_request.foliage_transaction_block_signature
-            )
 
         new_candidate = dataclasses.replace(candidate, foliage=fsb2)
         if not self.full_node.has_valid_pool_sig(new_candidate):
@@ -1077,6 +1087,10 @@ class FullNodeAPI:
 
     @api_request
     async def request_additions(self, request: wallet_protocol.RequestAdditions) -> Optional[Message]:
+        if request.puzzle_hashes is not None and len(request.puzzle_hashes) > MAX_NAMES_PER_REQUEST:
+            reject = wallet_protocol.RejectAdditionsRequest(request.height, request.header_hash)
+            return make_msg(ProtocolMessageTypes.reject_additions_request, reject)
+
         block: Optional[FullBlock] = await self.full_node.block_store.get_full_block(request.header_hash)
 
         # We lock so that the coin store does not get modified
@@ -1098,6 +1112,11 @@ class FullNodeAPI:
         if self.full_node.blockchain.height_to_hash(block.height) != request.header_hash:
             raise ValueError(f"Block {block.header_hash} no longer in chain")
 
+        if len(additions) > MAX_COINS_PER_RESPONSE:
+            self.log.warning(f"Too many additions at height {block.height} to respond: {len(additions)}")
+            reject = wallet_protocol.RejectAdditionsRequest(request.height, request.header_hash)
+            return make_msg(ProtocolMessageTypes.reject_additions_request, reject)
+
         puzzlehash_coins_map: Dict[bytes32, List[Coin]] = {}
         for coin_record in additions:
             if coin_record.coin.puzzle_hash in puzzlehash_coins_map:
@@ -1140,6 +1159,10 @@ class FullNodeAPI:
 
     @api_request
     async def request_removals(self, request: wallet_protocol.RequestRemovals) -> Optional[Message]:
+        if request.coin_names is not None and len(request.coin_names) > MAX_NAMES_PER_REQUEST:
+            reject = wallet_protocol.RejectRemovalsRequest(request.height, request.header_hash)
+            return make_msg(ProtocolMessageTypes.reject_removals_request, reject)
+
         block: Optional[FullBlock] = await self.full_node.block_store.get_full_block(request.header_hash)
 
         # We lock so that the coin store does not get modified
@@ -1157,14 +1180,17 @@ class FullNodeAPI:
         assert block is not None and block.foliage_transaction_block is not None
 
         # Note: this might return bad data if there is a reorg in this time
-        all_removals: List[CoinRecord] = await self.full_node.coin_store.get_coins_removed_at_height(block.height)
+        all_removals_dict: Dict[bytes32, Coin] = await self.full_node.coin_store.get_removed_coins_by_name_at_height(
+            block.height
+        )
 
         if self.full_node.blockchain.height_to_hash(block.height) != request.header_hash:
             raise ValueError(f"Block {block.header_hash} no longer in chain")
 
-        all_removals_dict: Dict[bytes32, Coin] = {}
-        for coin_record in all_removals:
-            all_removals_dict[coin_record.coin.name()] = coin_record.coin
+        if len(all_removals_dict) > MAX_COINS_PER_RESPONSE:
+            self.log.warning(f"Too many removals at height {block.height} to respond: {len(all_removals_dict)}")
+            reject = wallet_protocol.RejectRemovalsRequest(request.height, request.header_hash)
+            return make_msg(ProtocolMessageTypes.reject_removals_request, reject)
 
         coins_map: List[Tuple[bytes32, Optional[Coin]]] = []
         proofs_map: List[Tuple[bytes32, bytes]] = []
@@ -1205,6 +1231,10 @@ class FullNodeAPI:
     @api_request
     async def send_transaction(self, request: wallet_protocol.SendTransaction) -> Optional[Message]:
         spend_name = request.transaction.name()
+        # Wallets often re-broadcast, so don't re-validate a bundle that is already in the mempool
+        if self.full_node.mempool_manager.get_spendbundle(spend_name) is not None:
+            response = wallet_protocol.TransactionAck(spend_name, uint8(MempoolInclusionStatus.SUCCESS.value), None)
+            return make_msg(ProtocolMessageTypes.transaction_ack, response)
         status, error = await self.full_node.respond_transaction(request.transaction, spend_name)
         error_name = error.name if error is not None else None
         if status == MempoolInclusionStatus.SUCCESS:
@@ -1256,22 +1286,61 @@ class FullNodeAPI:
         if request.end_height < request.start_height or request.end_height - request.start_height > 32:
             return None
 
-        header_hashes = []
-        for i in range(request.start_height, request.end_height + 1):
-            if not self.full_node.blockchain.contains_height(uint32(i)):
+        header_hashes = self.full_node.blockchain.height_to_hash_range(request.start_height, request.end_height)
+        if header_hashes is None:
+            reject = RejectHeaderBlocks(request.start_height, request.end_height)
+            msg = make_msg(ProtocolMessageTypes.reject_header_blocks, reject)
+            return msg
+
+        header_block_cache = self.full_node.header_block_cache
+        cached_header_blocks: List[HeaderBlock] = []
+        for header_hash in header_hashes:
+            cached_header_block = header_block_cache.get(header_hash)
+            if cached_header_block is None:
+                break
+            cached_header_blocks.append(cached_header_block)
+        if len(cached_header_blocks) == len(header_hashes):
+            msg = make_msg(
+                ProtocolMessageTypes.respond_header_blocks,
+                wallet_protocol.RespondHeaderBlocks(request.start_height, request.end_height, cached_header_blocks),
+            )
+            return msg
+
+        # Fetch the blocks and their coins for the whole range at once, the coin queries only depend on the heights
+        blocks_in_range: Dict[bytes32, FullBlock]
+        blocks_in_range, added_coins_in_range, removal_names_in_range = await asyncio.gather(
+            self.full_node.block_store.get_full_blocks_in_range(request.start_height, request.end_height),
+            self.full_node.coin_store.get_added_coins_in_range(request.start_height, request.end_height),
+            self.full_node.coin_store.get_removed_coin_names_in_range(request.start_height, request.end_height),
+        )
+        # The coins were looked up by height: if the chain changed while awaiting, they may belong to other blocks
+        if self.full_node.blockchain.height_to_hash_range(request.start_height, request.end_height) != header_hashes:
+            reject = RejectHeaderBlocks(request.start_height, request.end_height)
+            msg = make_msg(ProtocolMessageTypes.reject_header_blocks, reject)
+            return msg
+
+        blocks: List[FullBlock] = []
+        for header_hash in header_hashes:
+            if header_hash not in blocks_in_range:
                 reject = RejectHeaderBlocks(request.start_height, request.end_height)
                 msg = make_msg(ProtocolMessageTypes.reject_header_blocks, reject)
                 return msg
-            header_hashes.append(self.full_node.blockchain.height_to_hash(uint32(i)))
+            blocks.append(blocks_in_range[header_hash])
+
+        # Split up the coins by height
+        added_coins: Dict[uint32, List[Coin]] = {}
+        for height, coin in added_coins_in_range:
+            added_coins.setdefault(height, []).append(coin)
+        removal_names: Dict[uint32, List[bytes32]] = {}
+        for height, coin_name in removal_names_in_range:
+            removal_names.setdefault(height, []).append(coin_name)
 
-        blocks: List[FullBlock] = await self.full_node.block_store.get_blocks_by_hash(header_hashes)
         header_blocks = []
         for block in blocks:
-            added_coins_records = await self.full_node.coin_store.get_coins_added_at_height(block.height)
-            removed_coins_records = await self.full_node.coin_store.get_coins_removed_at_height(block.height)
-            added_coins = [record.coin for record in added_coins_records if not record.coinbase]
-            removal_names = [record.coin.name() for record in removed_coins_records]
-            header_block = get_block_header(block, added_coins, removal_names)
+            header_block = get_block_header(
+                block, added_coins.get(block.height, []), removal_names.get(block.height, [])
+            )
+            header_block_cache.put(block.header_hash, header_block)
             header_blocks.append(header_block)
 
         msg = make_msg(
@@ -1289,30 +1358,32 @@ class FullNodeAPI:
     @execute_task
     @peer_required
     @api_request
-    @bytes_required
-    async def new_compact_vdf(
-        self, request: full_node_protocol.NewCompactVDF, peer: ws.WSTadConnection, request_bytes: bytes = b""
-    ):
+    async def new_compact_vdf(self, request: full_node_protocol.NewCompactVDF, peer: ws.WSTadConnection):
         if self.full_node.sync_store.get_sync_mode():
             return None
 
-        if len(self.full_node.compact_vdf_sem._waiters) > 20:
-            self.log.debug(f"Ignoring NewCompactVDF: {request}, _waiters")
+        # At most 4 requests hold the semaphore, allow 20 more waiting for it
+        if self.full_node.compact_vdf_pending > 24:
+            self.log.debug(f"Ignoring NewCompactVDF: {request}, too many pending")
             return
 
-        name = std_hash(request_bytes)
-        if name in self.full_node.compact_vdf_requests:
+        # The request is a frozen dataclass, so it can be used as the key directly, without hashing its bytes
+        if request in self.full_node.compact_vdf_requests:
             self.log.debug(f"Ignoring NewCompactVDF: {request}, already requested")
             return
-        self.full_node.compact_vdf_requests.add(name)
+        self.full_node.compact_vdf_requests.add(request)
 
         # this semaphore will only allow a limited number of tasks call
         # new_compact_vdf() at a time, since it can be expensive
-        async with self.full_node.compact_vdf_sem:
-            try:
-                await self.full_node.new_compact_vdf(request, peer)
-            finally:
-                self.full_node.compact_vdf_requests.remove(name)
+        self.full_node.compact_vdf_pending += 1
+        try:
+            async with self.full_node.compact_vdf_sem:
+                try:
+                    await self.full_node.new_compact_vdf(request, peer)
+                finally:
+                    self.full_node.compact_vdf_requests.remove(request)
+        finally:
+            self.full_node.compact_vdf_pending -= 1
 
     @peer_required
     @api_request
@@ -1334,37 +1405,40 @@ class FullNodeAPI:
     async def register_interest_in_puzzle_hash(
         self, request: wallet_protocol.RegisterForPhUpdates, peer: ws.WSTadConnection
     ):
-        if peer.peer_node_id not in self.full_node.peer_puzzle_hash:
-            self.full_node.peer_puzzle_hash[peer.peer_node_id] = set()
-
-        if peer.peer_node_id not in self.full_node.peer_sub_counter:
-            self.full_node.peer_sub_counter[peer.peer_node_id] = 0
-
-        hint_coin_ids = []
         # Add peer to the "Subscribed" dictionary
-        for puzzle_hash in request.puzzle_hashes:
-            ph_hint_coins = await self.full_node.hint_store.get_coin_ids(puzzle_hash)
-            hint_coin_ids.extend(ph_hint_coins)
-            if puzzle_hash not in self.full_node.ph_subscriptions:
-                self.full_node.ph_subscriptions[puzzle_hash] = set()
-            if (
-                peer.peer_node_id not in self.full_node.ph_subscriptions[puzzle_hash]
-                and self.full_node.peer_sub_counter[peer.peer_node_id] < 100000
-            ):
-                self.full_node.ph_subscriptions[puzzle_hash].add(peer.peer_node_id)
-                self.full_node.peer_puzzle_hash[peer.peer_node_id].add(puzzle_hash)
-                self.full_node.peer_sub_counter[peer.peer_node_id] += 1
-
-        # Send all coins with requested puzzle hash that have been created after the specified height
-        states: List[CoinState] = await self.full_node.coin_store.get_coin_states_by_puzzle_hashes(
-            include_spent_coins=True, puzzle_hashes=request.puzzle_hashes, start_height=request.min_height
+        peer_id = peer.peer_node_id
+        ph_subscriptions = self.full_node.ph_subscriptions
+        peer_puzzle_hashes = self.full_node.peer_puzzle_hash.setdefault(peer_id, set())
+        sub_count = self.full_node.peer_sub_counter.get(peer_id, 0)
+        # Puzzle hashes the peer is subscribed to, the ones over the subscription limit are not looked up
+        subscribed_hashes: List[bytes32] = []
+        # Duplicates would otherwise be looked up more than once
+        for puzzle_hash in dict.fromkeys(request.puzzle_hashes):
+            subscribed_peers = ph_subscriptions.get(puzzle_hash)
+            if subscribed_peers is None or peer_id not in subscribed_peers:
+                if sub_count >= 100000:
+                    continue
+                if subscribed_peers is None:
+                    ph_subscriptions[puzzle_hash] = {peer_id}
+                else:
+                    subscribed_peers.add(peer_id)
+                peer_puzzle_hashes.add(puzzle_hash)
+                sub_count += 1
+            subscribed_hashes.append(puzzle_hash)
+        self.full_node.peer_sub_counter[peer_id] = sub_count
+
+        # Send all coins with requested puzzle hash, and the coins hinted to them, that have been created after the
+        # specified height
+        states: List[CoinState]
+        states, hint_states = await asyncio.gather(
+            self.full_node.coin_store.get_coin_states_by_puzzle_hashes(
+                include_spent_coins=True, puzzle_hashes=subscribed_hashes, start_height=request.min_height
+            ),
+            self.full_node.coin_store.get_coin_states_by_hints(
+                include_spent_coins=True, hints=subscribed_hashes, start_height=request.min_height
+            ),
         )
-
-        if len(hint_coin_ids) > 0:
-            hint_states = await self.full_node.coin_store.get_coin_state_by_ids(
-                include_spent_coins=True, coin_ids=hint_coin_ids, start_height=request.min_height
-            )
-            states.extend(hint_states)
+        states.extend(hint_states)
 
         response = wallet_protocol.RespondToPhUpdates(request.puzzle_hashes, request.min_height, states)
         msg = make_msg(ProtocolMessageTypes.respond_to_ph_update, response)
@@ -1375,25 +1449,28 @@ class FullNodeAPI:
     async def register_interest_in_coin(
         self, request: wallet_protocol.RegisterForCoinUpdates, peer: ws.WSTadConnection
     ):
-        if peer.peer_node_id not in self.full_node.peer_coin_ids:
-            self.full_node.peer_coin_ids[peer.peer_node_id] = set()
-
-        if peer.peer_node_id not in self.full_node.peer_sub_counter:
-            self.full_node.peer_sub_counter[peer.peer_node_id] = 0
-
-        for coin_id in request.coin_ids:
-            if coin_id not in self.full_node.coin_subscriptions:
-                self.full_node.coin_subscriptions[coin_id] = set()
-            if (
-                peer.peer_node_id not in self.full_node.coin_subscriptions[coin_id]
-                and self.full_node.peer_sub_counter[peer.peer_node_id] < 100000
-            ):
-                self.full_node.coin_subscriptions[coin_id].add(peer.peer_node_id)
-                self.full_node.peer_coin_ids[peer.peer_node_id].add(coin_id)
-                self.full_node.peer_sub_counter[peer.peer_node_id] += 1
+        peer_id = peer.peer_node_id
+        coin_subscriptions = self.full_node.coin_subscriptions
+        peer_coin_ids = self.full_node.peer_coin_ids.setdefault(peer_id, set())
+        sub_count = self.full_node.peer_sub_counter.get(peer_id, 0)
+        # Coin ids the peer is subscribed to, the ones over the subscription limit are not looked up
+        subscribed_ids: List[bytes32] = []
+        for coin_id in dict.fromkeys(request.coin_ids):
+            subscribed_peers = coin_subscriptions.get(coin_id)
+            if subscribed_peers is None or peer_id not in subscribed_peers:
+                if sub_count >= 100000:
+                    continue
+                if subscribed_peers is None:
+                    coin_subscriptions[coin_id] = {peer_id}
+                else:
+                    subscribed_peers.add(peer_id)
+                peer_coin_ids.add(coin_id)
+                sub_count += 1
+            subscribed_ids.append(coin_id)
+        self.full_node.peer_sub_counter[peer_id] = sub_count
 
         states: List[CoinState] = await self.full_node.coin_store.get_coin_state_by_ids(
-            include_spent_coins=True, coin_ids=request.coin_ids, start_height=request.min_height
+            include_spent_coins=True, coin_ids=subscribed_ids, start_height=request.min_height
         )
 
         response = wallet_protocol.RespondToCoinUpdates(request.coin_ids, request.min_height, states)
@@ -1420,27 +1497,20 @@ class FullNodeAPI:
         ses_hash_heights = []
         ses_reward_hashes = []
 
-        for idx, ses_start_height in enumerate(ses_height):
-            if idx == len(ses_height) - 1:
-                break
-
+        # Index of the sub-epoch that contains start_height, it must have a following sub-epoch to be returned
+        idx = bisect.bisect_right(ses_height, start_height) - 1
+        if 0 <= idx < len(ses_height) - 1:
+            ses_start_height = ses_height[idx]
             next_ses_height = ses_height[idx + 1]
-            # start_ses_hash
-            if ses_start_height <= start_height < next_ses_height:
-                ses_hash_heights.append([ses_start_height, next_ses_height])
-                ses: SubEpochSummary = self.full_node.blockchain.get_ses(ses_start_height)
-                ses_reward_hashes.append(ses.reward_chain_hash)
-                if ses_start_height < end_height < next_ses_height:
-                    break
-                else:
-                    if idx == len(ses_height) - 2:
-                        break
-                    # else add extra ses as request start <-> end spans two ses
-                    next_next_height = ses_height[idx + 2]
-                    ses_hash_heights.append([next_ses_height, next_next_height])
-                    nex_ses: SubEpochSummary = self.full_node.blockchain.get_ses(next_ses_height)
-                    ses_reward_hashes.append(nex_ses.reward_chain_hash)
-                    break
+            ses_hash_heights.append([ses_start_height, next_ses_height])
+            ses: SubEpochSummary = self.full_node.blockchain.get_ses(ses_start_height)
+            ses_reward_hashes.append(ses.reward_chain_hash)
+            # add extra ses as request start <-> end spans two ses
+            if not (ses_start_height < end_height < next_ses_height) and idx < len(ses_height) - 2:
+                next_next_height = ses_height[idx + 2]
+                ses_hash_heights.append([next_ses_height, next_next_height])
+                nex_ses: SubEpochSummary = self.full_node.blockchain.get_ses(next_ses_height)
+                ses_reward_hashes.append(nex_ses.reward_chain_hash)
 
         response = RespondSESInfo(ses_reward_hashes, ses_hash_heights)
         msg = make_msg(ProtocolMessageTypes.respond_ses_hashes, response)
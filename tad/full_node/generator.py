@@ -15,6 +15,13 @@ DECOMPRESS_PUZZLE = load_clvm("decompress_puzzle.clvm", package_or_requirement="
 DECOMPRESS_CSE_WITH_PREFIX = load_clvm(
     "decompress_coin_spend_entry_with_prefix.clvm", package_or_requirement="tad.wallet.puzzles"
 )
+
+# A curried program is (a (q . mod) (c (q . arg1) (c (q . arg2) ... 1))). The module and the first two arguments of
+# DECOMPRESS_BLOCK never change, so quote them once here and only build the per-block part of the tree at runtime.
+# This produces exactly the same program as DECOMPRESS_BLOCK.curry(...), without running the curry program.
+DECOMPRESS_BLOCK_QUOTED = Program.to((1, DECOMPRESS_BLOCK))
+DECOMPRESS_PUZZLE_QUOTED = Program.to((1, DECOMPRESS_PUZZLE))
+DECOMPRESS_CSE_WITH_PREFIX_QUOTED = Program.to((1, DECOMPRESS_CSE_WITH_PREFIX))
 log = logging.getLogger(__name__)
 
 
@@ -50,9 +57,9 @@ def create_compressed_generator(
     """
     start = original_generator.start
     end = original_generator.end
-    program = DECOMPRESS_BLOCK.curry(
-        DECOMPRESS_PUZZLE, DECOMPRESS_CSE_WITH_PREFIX, Program.to(start), Program.to(end), compressed_cse_list
-    )
+    block_args = [4, (1, start), [4, (1, end), [4, (1, compressed_cse_list), 1]]]
+    curried_args = [4, DECOMPRESS_PUZZLE_QUOTED, [4, DECOMPRESS_CSE_WITH_PREFIX_QUOTED, block_args]]
+    program = Program.to([2, DECOMPRESS_BLOCK_QUOTED, curried_args])
     generator_arg = GeneratorArg(original_generator.block_height, original_generator.generator)
     return BlockGenerator(program, [generator_arg])
 
@@ -24,9 +24,7 @@ class HintStore:
         return self
 
     async def get_coin_ids(self, hint: bytes) -> List[bytes32]:
-        cursor = await self.coin_record_db.execute("SELECT * from hints WHERE hint=?", (hint,))
-        rows = await cursor.fetchall()
-        await cursor.close()
+        rows = await self.coin_record_db.execute_fetchall("SELECT * from hints WHERE hint=?", (hint,))
         coin_ids = []
         for row in rows:
             coin_ids.append(row[1])
@@ -101,8 +101,8 @@ class Harvester:
                     {
                         "filename": str(path),
                         "size": prover.get_size(),
-                        "plot-seed": prover.get_id(),  # Deprecated
-                        "plot_id": prover.get_id(),
+                        "plot-seed": plot_info.plot_id,  # Deprecated
+                        "plot_id": plot_info.plot_id,
                         "pool_public_key": plot_info.pool_public_key,
                         "pool_contract_puzzle_hash": plot_info.pool_contract_puzzle_hash,
                         "plot_public_key": plot_info.plot_public_key,
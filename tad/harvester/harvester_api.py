@@ -73,7 +73,7 @@ class HarvesterAPI:
             # Uses the DiskProver object to lookup qualities. This is a blocking call,
             # so it should be run in a thread pool.
             try:
-                plot_id = plot_info.prover.get_id()
+                plot_id = plot_info.plot_id
                 sp_challenge_hash = ProofOfSpace.calculate_pos_challenge(
                     plot_id,
                     new_challenge.challenge_hash,
@@ -190,7 +190,7 @@ class HarvesterAPI:
                         total += 1
                         if ProofOfSpace.passes_plot_filter(
                             self.harvester.constants,
-                            try_plot_info.prover.get_id(),
+                            try_plot_info.plot_id,
                             new_challenge.challenge_hash,
                             new_challenge.sp_hash,
                         ):
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+import io
 import logging
+import os
 import threading
 import time
 import traceback
@@ -20,7 +22,7 @@ from tad.plotting.util import (
     stream_plot_info_pk,
     stream_plot_info_ph,
 )
-from tad.util.ints import uint16
+from tad.util.ints import uint16, uint32
 from tad.util.path import mkdir
 from tad.util.streamable import Streamable, streamable
 from tad.types.blockchain_format.proof_of_space import ProofOfSpace
@@ -50,10 +52,12 @@ class DiskCache(Streamable):
 class Cache:
     _changed: bool
     _data: Dict[bytes32, CacheEntry]
+    _serialized_entries: Dict[bytes32, bytes]
 
     def __init__(self, path: Path):
         self._changed = False
         self._data = {}
+        self._serialized_entries = {}
         self._path = path
         if not path.parent.exists():
             mkdir(path.parent)
@@ -63,23 +67,46 @@ class Cache:
 
     def update(self, plot_id: bytes32, entry: CacheEntry):
         self._data[plot_id] = entry
+        self._serialized_entries.pop(plot_id, None)
         self._changed = True
 
     def remove(self, cache_keys: List[bytes32]):
         for key in cache_keys:
             if key in self._data:
                 del self._data[key]
+                self._serialized_entries.pop(key, None)
                 self._changed = True
 
+    def serialize(self) -> bytes:
+        """
+        Returns the same bytes as `bytes(DiskCache(CURRENT_VERSION, list(self.items())))`, but only entries which
+        changed since the last call get serialized.
+        """
+        serialized = bytearray(bytes(CURRENT_VERSION))
+        serialized += bytes(uint32(len(self._data)))
+        for plot_id, cache_entry in self._data.items():
+            serialized_entry: Optional[bytes] = self._serialized_entries.get(plot_id)
+            if serialized_entry is None:
+                serialized_entry = bytes(cache_entry)
+                self._serialized_entries[plot_id] = serialized_entry
+            serialized += plot_id
+            serialized += serialized_entry
+        return bytes(serialized)
+
     def save(self):
         try:
-            disk_cache: DiskCache = DiskCache(
-                CURRENT_VERSION, [(plot_id, cache_entry) for plot_id, cache_entry in self.items()]
-            )
-            serialized: bytes = bytes(disk_cache)
-            self._path.write_bytes(serialized)
+            serialized: bytes = self.serialize()
+            # Write to a temporary file first so that an interrupted save never leaves a truncated cache behind
+            tmp_path: Path = self._path.with_suffix("." + str(os.getpid()))
+            with open(tmp_path, "wb") as f:
+                f.write(serialized)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(str(tmp_path), str(self._path))
             self._changed = False
             log.info(f"Saved {len(serialized)} bytes of cached data")
+        except OSError as e:
+            log.error(f"Failed to write cache {self._path}: {e}")
         except Exception as e:
             log.error(f"Failed to save cache: {e}, {traceback.format_exc()}")
 
@@ -87,11 +114,22 @@ class Cache:
         try:
             serialized = self._path.read_bytes()
             log.info(f"Loaded {len(serialized)} bytes of cached data")
-            stored_cache: DiskCache = DiskCache.from_bytes(serialized)
-            if stored_cache.version != CURRENT_VERSION:
+            # Parse the `DiskCache` layout entry by entry to keep the serialized entries around for the next `save`
+            f = io.BytesIO(serialized)
+            version: uint16 = uint16.parse(f)
+            if version != CURRENT_VERSION:
                 # TODO, Migrate or drop current cache if the version changes.
-                raise ValueError(f"Invalid cache version {stored_cache.version}. Expected version {CURRENT_VERSION}.")
-            self._data = {plot_id: cache_entry for plot_id, cache_entry in stored_cache.data}
+                raise ValueError(f"Invalid cache version {version}. Expected version {CURRENT_VERSION}.")
+            data: Dict[bytes32, CacheEntry] = {}
+            serialized_entries: Dict[bytes32, bytes] = {}
+            for _ in range(uint32.parse(f)):
+                plot_id: bytes32 = bytes32.parse(f)
+                entry_start = f.tell()
+                data[plot_id] = CacheEntry.parse(f)
+                serialized_entries[plot_id] = serialized[entry_start : f.tell()]
+            assert f.read() == b""
+            self._data = data
+            self._serialized_entries = serialized_entries
         except FileNotFoundError:
             log.debug(f"Cache {self._path} not found")
         except Exception as e:
@@ -121,6 +159,8 @@ class PlotManager:
     no_key_filenames: Set[Path]
     farmer_public_keys: List[G1Element]
     pool_public_keys: List[G1Element]
+    _farmer_public_key_bytes: Set[bytes]
+    _pool_public_key_bytes: Set[bytes]
     cache: Cache
     match_str: Optional[str]
     show_memo: bool
@@ -130,6 +170,7 @@ class PlotManager:
     log: Any
     _lock: threading.Lock
     _refresh_thread: Optional[threading.Thread]
+    _refresh_event: threading.Event
     _refreshing_enabled: bool
     _refresh_callback: Callable
 
@@ -150,6 +191,8 @@ class PlotManager:
         self.no_key_filenames = set()
         self.farmer_public_keys = []
         self.pool_public_keys = []
+        self._farmer_public_key_bytes = set()
+        self._pool_public_key_bytes = set()
         self.cache = Cache(self.root_path.resolve() / "cache" / "plot_manager.dat")
         self.match_str = match_str
         self.show_memo = show_memo
@@ -159,6 +202,7 @@ class PlotManager:
         self.log = logging.getLogger(__name__)
         self._lock = threading.Lock()
         self._refresh_thread = None
+        self._refresh_event = threading.Event()
         self._refreshing_enabled = False
         self._refresh_callback = refresh_callback  # type: ignore
 
@@ -174,6 +218,9 @@ class PlotManager:
     def set_public_keys(self, farmer_public_keys: List[G1Element], pool_public_keys: List[G1Element]):
         self.farmer_public_keys = farmer_public_keys
         self.pool_public_keys = pool_public_keys
+        # Serialized once here, so checking the keys of a plot is a set lookup instead of comparing against every key
+        self._farmer_public_key_bytes = set(bytes(pk) for pk in farmer_public_keys)
+        self._pool_public_key_bytes = set(bytes(pk) for pk in pool_public_keys)
 
     def public_keys_available(self):
         return len(self.farmer_public_keys) and len(self.pool_public_keys)
@@ -194,6 +241,7 @@ class PlotManager:
 
     def stop_refreshing(self):
         self._refreshing_enabled = False
+        self._refresh_event.set()
         if self._refresh_thread is not None and self._refresh_thread.is_alive():
             self._refresh_thread.join()
             self._refresh_thread = None
@@ -201,12 +249,16 @@ class PlotManager:
     def trigger_refresh(self):
         log.debug("trigger_refresh")
         self.last_refresh_time = 0
+        self._refresh_event.set()
 
     def _refresh_task(self):
         while self._refreshing_enabled:
 
+            # Sleep until the next refresh is due, `trigger_refresh` and `stop_refreshing` wake us up earlier
             while not self.needs_refresh() and self._refreshing_enabled:
-                time.sleep(1)
+                time_to_refresh = self.last_refresh_time + self.refresh_parameter.interval_seconds - time.time()
+                self._refresh_event.wait(max(0.0, time_to_refresh))
+                self._refresh_event.clear()
 
             plot_filenames: Dict[Path, List[Path]] = get_plot_filenames(self.root_path)
             plot_directories: Set[Path] = set(plot_filenames.keys())
@@ -226,8 +278,8 @@ class PlotManager:
                 time.sleep(float(batch_sleep) / 1000.0)
 
             # Cleanup unused cache
-            available_ids = set([plot_info.prover.get_id() for plot_info in self.plots.values()])
-            invalid_cache_keys = [plot_id for plot_id in self.cache.keys() if plot_id not in available_ids]
+            available_ids = set(plot_info.plot_id for plot_info in self.plots.values())
+            invalid_cache_keys = list(self.cache.keys() - available_ids)
             self.cache.remove(invalid_cache_keys)
             self.log.debug(f"_refresh_task: cached entries removed: {len(invalid_cache_keys)}")
 
@@ -257,8 +309,6 @@ class PlotManager:
             filename_str = str(file_path)
             if self.match_str is not None and self.match_str not in filename_str:
                 return None
-            if not file_path.exists():
-                return None
             if (
                 file_path in self.failed_to_open_filenames
                 and (time.time() - self.failed_to_open_filenames[file_path])
@@ -266,19 +316,23 @@ class PlotManager:
             ):
                 # Try once every `refresh_parameter.retry_invalid_seconds` seconds to open the file
                 return None
-            if file_path in self.plots:
-                try:
-                    stat_info = file_path.stat()
-                except Exception as e:
-                    log.error(f"Failed to open file {file_path}. {e}")
-                    return None
-                if stat_info.st_mtime == self.plots[file_path].time_modified:
-                    return self.plots[file_path]
-            entry: Optional[Tuple[str, Set[str]]] = self.plot_filename_paths.get(file_path.name)
+            # A single stat both checks that the file still exists and provides the size and modification time
+            try:
+                stat_info = file_path.stat()
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                log.error(f"Failed to open file {file_path}. {e}")
+                return None
+            if file_path in self.plots and stat_info.st_mtime == self.plots[file_path].time_modified:
+                return self.plots[file_path]
+            file_name = file_path.name
+            parent_str = str(file_path.parent)
+            entry: Optional[Tuple[str, Set[str]]] = self.plot_filename_paths.get(file_name)
             if entry is not None:
                 loaded_parent, duplicates = entry
-                if str(file_path.parent) in duplicates:
-                    log.debug(f"Skip duplicated plot {str(file_path)}")
+                if parent_str in duplicates:
+                    log.debug(f"Skip duplicated plot {filename_str}")
                     return None
             try:
                 with counter_lock:
@@ -287,12 +341,11 @@ class PlotManager:
                         return None
                     result.processed_files += 1
 
-                prover = DiskProver(str(file_path))
+                prover = DiskProver(filename_str)
 
-                log.debug(f"process_file {str(file_path)}")
+                log.debug(f"process_file {filename_str}")
 
                 expected_size = _expected_plot_size(prover.get_size()) * UI_ACTUAL_SPACE_CONSTANT_FACTOR
-                stat_info = file_path.stat()
 
                 # TODO: consider checking if the file was just written to (which would mean that the file is still
                 # being copied). A segfault might happen in this edge case.
@@ -304,7 +357,10 @@ class PlotManager:
                     )
                     return None
 
-                cache_entry = self.cache.get(prover.get_id())
+                # `get_id` copies the id out of the prover each call, so only do it once. It returns plain bytes, which
+                # hash and compare equal to the `bytes32` keys loaded from disk, so no conversion is needed.
+                plot_id: bytes = prover.get_id()
+                cache_entry = self.cache.get(plot_id)
                 if cache_entry is None:
                     (
                         pool_public_key_or_puzzle_hash,
@@ -313,7 +369,7 @@ class PlotManager:
                     ) = parse_plot_info(prover.get_memo())
 
                     # Only use plots that correct keys associated with them
-                    if farmer_public_key not in self.farmer_public_keys:
+                    if bytes(farmer_public_key) not in self._farmer_public_key_bytes:
                         log.warning(f"Plot {file_path} has a farmer public key that is not in the farmer's pk list.")
                         self.no_key_filenames.add(file_path)
                         if not self.open_no_key_filenames:
@@ -327,7 +383,7 @@ class PlotManager:
                         assert isinstance(pool_public_key_or_puzzle_hash, bytes32)
                         pool_contract_puzzle_hash = pool_public_key_or_puzzle_hash
 
-                    if pool_public_key is not None and pool_public_key not in self.pool_public_keys:
+                    if pool_public_key is not None and bytes(pool_public_key) not in self._pool_public_key_bytes:
                         log.warning(f"Plot {file_path} has a pool public key that is not in the farmer's pool pk list.")
                         self.no_key_filenames.add(file_path)
                         if not self.open_no_key_filenames:
@@ -340,19 +396,20 @@ class PlotManager:
                     )
 
                     cache_entry = CacheEntry(pool_public_key, pool_contract_puzzle_hash, plot_public_key)
-                    self.cache.update(prover.get_id(), cache_entry)
+                    self.cache.update(plot_id, cache_entry)
 
+                # The prover was opened with `filename_str`, so its parent is `parent_str`
                 with self.plot_filename_paths_lock:
-                    if file_path.name not in self.plot_filename_paths:
-                        self.plot_filename_paths[file_path.name] = (str(Path(prover.get_filename()).parent), set())
+                    paths_entry = self.plot_filename_paths.get(file_name)
+                    if paths_entry is None:
+                        paths_entry = (parent_str, set())
+                        self.plot_filename_paths[file_name] = paths_entry
                     else:
-                        self.plot_filename_paths[file_path.name][1].add(str(Path(prover.get_filename()).parent))
-                    if len(self.plot_filename_paths[file_path.name][1]) > 0:
-                        log.warning(
-                            f"Have multiple copies of the plot {file_path} in "
-                            f"{self.plot_filename_paths[file_path.name][1]}."
-                        )
-                        return None
+                        paths_entry[1].add(parent_str)
+                    duplicated_paths: Optional[Set[str]] = set(paths_entry[1]) if len(paths_entry[1]) > 0 else None
+                if duplicated_paths is not None:
+                    log.warning(f"Have multiple copies of the plot {file_path} in {duplicated_paths}.")
+                    return None
 
                 new_plot_info: PlotInfo = PlotInfo(
                     prover,
@@ -361,6 +418,7 @@ class PlotManager:
                     cache_entry.plot_public_key,
                     stat_info.st_size,
                     stat_info.st_mtime,
+                    bytes32(plot_id),
                 )
 
                 with counter_lock:
@@ -388,17 +446,24 @@ class PlotManager:
 
             return new_plot_info
 
-        with self, ThreadPoolExecutor() as executor:
+        with self, ThreadPoolExecutor(max_workers=self.refresh_parameter.num_refresh_workers) as executor:
+
+            # First drop all plots we have in plot_filename_paths but not longer in the filesystem or set in config.
+            # `plot_paths` is the listing of the configured directories, so no need to check the filesystem again.
+            # It's grouped the same way as `plot_filename_paths` (directory string : file names) so the checks below
+            # don't need to build any paths.
+            existing_plots: Dict[str, Set[str]] = {}
+            for plot_path in plot_paths:
+                existing_plots.setdefault(str(plot_path.parent), set()).add(plot_path.name)
 
-            # First drop all plots we have in plot_filename_paths but not longer in the filesystem or set in config
-            def plot_removed(test_path: Path):
-                return not test_path.exists() or test_path.parent not in plot_directories
+            def plot_removed(directory: str, plot_filename: str):
+                return plot_filename not in existing_plots.get(directory, ())
 
             with self.plot_filename_paths_lock:
                 filenames_to_remove: List[str] = []
                 for plot_filename, paths_entry in self.plot_filename_paths.items():
                     loaded_path, duplicated_paths = paths_entry
-                    if plot_removed(Path(loaded_path) / Path(plot_filename)):
+                    if plot_removed(loaded_path, plot_filename):
                         filenames_to_remove.append(plot_filename)
                         result.removed_plots += 1
                         # No need to check the duplicates here since we drop the whole entry
@@ -406,7 +471,7 @@ class PlotManager:
 
                     paths_to_remove: List[str] = []
                     for path in duplicated_paths:
-                        if plot_removed(Path(path) / Path(plot_filename)):
+                        if plot_removed(path, plot_filename):
                             paths_to_remove.append(path)
                             result.removed_plots += 1
                     for path in paths_to_remove:
@@ -1,4 +1,5 @@
 import logging
+import os
 
 from dataclasses import dataclass
 from pathlib import Path
@@ -19,6 +20,7 @@ class PlotsRefreshParameter:
     retry_invalid_seconds: int = 1200
     batch_size: int = 300
     batch_sleep_milliseconds: int = 1
+    num_refresh_workers: int = 4
 
 
 @dataclass
@@ -29,6 +31,7 @@ class PlotInfo:
     plot_public_key: G1Element
     file_size: int
     time_modified: float
+    plot_id: bytes32
 
 
 @dataclass
@@ -109,13 +112,15 @@ def get_filenames(directory: Path) -> List[Path]:
         return []
     all_files: List[Path] = []
     try:
-        for child in directory.iterdir():
-            if not child.is_dir():
-                # If it is a file ending in .plot, add it - work around MacOS ._ files
-                if child.suffix == ".plot" and not child.name.startswith("._"):
-                    all_files.append(child)
-            else:
-                log.debug(f"Not checking subdirectory {child}, subdirectories not added by default")
+        # `os.scandir` gets the file type with the directory listing, so this doesn't stat every entry
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    # If it is a file ending in .plot, add it - work around MacOS ._ files
+                    if os.path.splitext(entry.name)[1] == ".plot" and not entry.name.startswith("._"):
+                        all_files.append(directory / entry.name)
+                else:
+                    log.debug(f"Not checking subdirectory {entry.path}, subdirectories not added by default")
     except Exception as e:
         log.warning(f"Error reading directory {directory} {e}")
     return all_files
@@ -19,15 +19,19 @@ class ClassgroupElement(Streamable):
     @staticmethod
     def from_bytes(data) -> "ClassgroupElement":
         if len(data) < 100:
-            data += b"\x00" * (100 - len(data))
+            data = data + bytes(100 - len(data))
         return ClassgroupElement(bytes100(data))
 
     @staticmethod
     def get_default_element() -> "ClassgroupElement":
-        # Bit 3 in the first byte of serialized compressed form indicates if
-        # it's the default generator element.
-        return ClassgroupElement.from_bytes(b"\x08")
+        # The element is immutable, so the same instance is returned every time (see `DEFAULT_ELEMENT` below)
+        return DEFAULT_ELEMENT
 
     @staticmethod
     def get_size(constants: ConsensusConstants):
         return 100
+
+
+# Bit 3 in the first byte of serialized compressed form indicates if
+# it's the default generator element.
+DEFAULT_ELEMENT: ClassgroupElement = ClassgroupElement.from_bytes(b"\x08")
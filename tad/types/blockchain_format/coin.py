@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, List, Optional
 
 from tad.types.blockchain_format.sized_bytes import bytes32
 from tad.util.clvm import int_to_bytes
@@ -30,7 +30,12 @@ class Coin(Streamable):
         return std_hash(self.parent_coin_info + self.puzzle_hash + int_to_bytes(self.amount))
 
     def name(self) -> bytes32:
-        return self.get_hash()
+        # Hashed once and cached outside the dataclass fields, the coin is frozen
+        name: Optional[bytes32] = self.__dict__.get("_name")
+        if name is None:
+            name = self.get_hash()
+            object.__setattr__(self, "_name", name)
+        return name
 
     def as_list(self) -> List[Any]:
         return [self.parent_coin_info, self.puzzle_hash, self.amount]
@@ -53,10 +58,9 @@ class Coin(Streamable):
 
 
 def hash_coin_list(coin_list: List[Coin]) -> bytes32:
-    coin_list.sort(key=lambda x: x.name_str, reverse=True)
-    buffer = bytearray()
+    # Compute each coin id once, and hash the concatenation of the ids with a single call. Sorting the raw ids
+    # gives the same order as sorting their hex strings.
+    named_coins = sorted(((coin.name(), coin) for coin in coin_list), key=lambda x: x[0], reverse=True)
+    coin_list[:] = [coin for _, coin in named_coins]
 
-    for coin in coin_list:
-        buffer.extend(coin.name())
-
-    return std_hash(buffer)
+    return std_hash(b"".join(name for name, _ in named_coins))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from tad.consensus.cost_calculator import NPCResult
 from tad.types.blockchain_format.coin import Coin
@@ -27,7 +27,12 @@ class MempoolItem(Streamable):
 
     @property
     def fee_per_cost(self) -> float:
-        return int(self.fee) / int(self.cost)
+        # Read several times per item by the mempool, cached like Coin.name
+        fee_per_cost: Optional[float] = self.__dict__.get("_fee_per_cost")
+        if fee_per_cost is None:
+            fee_per_cost = int(self.fee) / int(self.cost)
+            object.__setattr__(self, "_fee_per_cost", fee_per_cost)
+        return fee_per_cost
 
     @property
     def name(self) -> bytes32:
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from tad.types.blockchain_format.sized_bytes import bytes32
 from tad.types.condition_with_args import ConditionWithArgs
@@ -15,8 +15,10 @@ class NPC(Streamable):
     conditions: List[Tuple[ConditionOpcode, List[ConditionWithArgs]]]
 
     @property
-    def condition_dict(self):
-        d: Dict[ConditionOpcode, List[ConditionWithArgs]] = {}
-        for opcode, l in self.conditions:
-            d[opcode] = l
+    def condition_dict(self) -> Dict[ConditionOpcode, List[ConditionWithArgs]]:
+        # Cached like Coin.name, callers must not modify the returned dict
+        d: Optional[Dict[ConditionOpcode, List[ConditionWithArgs]]] = self.__dict__.get("_condition_dict")
+        if d is None:
+            d = dict(self.conditions)
+            object.__setattr__(self, "_condition_dict", d)
         return d
@@ -1,15 +1,10 @@
 #!/usr/bin/env python3
 
 import click
-import colorama
 import threading
-import yaml
 
-from tad.cmds.passphrase_funcs import read_passphrase_from_file
 from tad.util.default_root import DEFAULT_KEYS_ROOT_PATH
 from tad.util.file_keyring import FileKeyring
-from tad.util.keyring_wrapper import DEFAULT_PASSPHRASE_IF_NO_MASTER_PASSPHRASE
-from cryptography.exceptions import InvalidTag
 from getpass import getpass
 from io import TextIOWrapper
 from pathlib import Path
@@ -27,6 +22,8 @@ class DumpKeyring(FileKeyring):  # lgtm [py/missing-call-to-init]
 
 
 def get_passphrase_prompt(keyring_file: str) -> str:
+    import colorama
+
     prompt = (
             colorama.Fore.YELLOW
             + colorama.Style.BRIGHT
@@ -51,6 +48,12 @@ def get_passphrase_prompt(keyring_file: str) -> str:
 @click.option("--passphrase-file", type=click.File("r"), help="File or descriptor to read the passphrase from")
 @click.option("--pretty-print", is_flag=True, default=False)
 def dump(keyring_file, full_payload: bool, passphrase_file: Optional[TextIOWrapper], pretty_print: bool):
+    import yaml
+
+    from cryptography.exceptions import InvalidTag
+    from tad.cmds.passphrase_funcs import read_passphrase_from_file
+    from tad.util.keyring_wrapper import DEFAULT_PASSPHRASE_IF_NO_MASTER_PASSPHRASE
+
     passphrase: str = DEFAULT_PASSPHRASE_IF_NO_MASTER_PASSPHRASE
     prompt: str = get_passphrase_prompt(str(keyring_file))
     data: Dict[str, Any] = {}
@@ -75,11 +78,17 @@ def dump(keyring_file, full_payload: bool, passphrase_file: Optional[TextIOWrapp
                 data = keyring.payload_cache
 
             if pretty_print:
-                print(yaml.dump(data))
+                # Use the libyaml-backed dumper when available
+                dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+                print(yaml.dump(data, Dumper=dumper))
             else:
                 print(data)
             break
         except (ValueError, InvalidTag):
+            if passphrase_file is not None:
+                # Re-prompting won't help when the passphrase came from a file
+                print("Incorrect passphrase read from passphrase file")
+                break
             passphrase = getpass(prompt)
         except Exception as e:
             print(f"Unhandled exception: {e}")
@@ -87,6 +96,8 @@ def dump(keyring_file, full_payload: bool, passphrase_file: Optional[TextIOWrapp
 
 
 def main():
+    import colorama
+
     colorama.init()
     dump()  # pylint: disable=no-value-for-parameter
 
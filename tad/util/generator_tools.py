@@ -1,3 +1,5 @@
+from itertools import chain
+from operator import attrgetter
 from typing import List, Tuple
 from chiabip158 import PyBIP158
 
@@ -8,19 +10,28 @@ from tad.types.header_block import HeaderBlock
 from tad.types.name_puzzle_condition import NPC
 from tad.util.condition_tools import created_outputs_for_conditions_dict
 
+# The filter of every non transaction block, encoded once instead of for each header block
+EMPTY_ENCODED_FILTER: bytes = bytes(PyBIP158([]).GetEncoded())
+
+_npc_name_and_conditions = attrgetter("coin_name", "condition_dict")
+
 
 def get_block_header(block: FullBlock, tx_addition_coins: List[Coin], removals_names: List[bytes32]) -> HeaderBlock:
     # Create filter
-    byte_array_tx: List[bytes32] = []
-    addition_coins = tx_addition_coins + list(block.get_included_reward_coins())
+    # The items stay bytearrays: the PyBIP158 binding converts sequences to vectors, and it refuses bytes objects
+    byte_array_tx: List[bytearray] = []
     if block.is_transaction_block():
-        for coin in addition_coins:
-            byte_array_tx.append(bytearray(coin.puzzle_hash))
-        for name in removals_names:
-            byte_array_tx.append(bytearray(name))
+        byte_array_tx = [
+            bytearray(coin.puzzle_hash) for coin in chain(tx_addition_coins, block.get_included_reward_coins())
+        ]
+        byte_array_tx.extend(bytearray(name) for name in removals_names)
 
-    bip158: PyBIP158 = PyBIP158(byte_array_tx)
-    encoded_filter: bytes = bytes(bip158.GetEncoded())
+    encoded_filter: bytes
+    if len(byte_array_tx) == 0:
+        encoded_filter = EMPTY_ENCODED_FILTER
+    else:
+        bip158: PyBIP158 = PyBIP158(byte_array_tx)
+        encoded_filter = bytes(bip158.GetEncoded())
 
     return HeaderBlock(
         block.finished_sub_slots,
@@ -39,10 +50,10 @@ def get_block_header(block: FullBlock, tx_addition_coins: List[Coin], removals_n
 
 def additions_for_npc(npc_list: List[NPC]) -> List[Coin]:
     additions: List[Coin] = []
+    extend = additions.extend
 
-    for npc in npc_list:
-        for coin in created_outputs_for_conditions_dict(npc.condition_dict, npc.coin_name):
-            additions.append(coin)
+    for coin_name, condition_dict in map(_npc_name_and_conditions, npc_list):
+        extend(created_outputs_for_conditions_dict(condition_dict, coin_name))
 
     return additions
 
@@ -55,12 +66,13 @@ def tx_removals_and_additions(npc_list: List[NPC]) -> Tuple[List[bytes32], List[
     removals: List[bytes32] = []
     additions: List[Coin] = []
 
-    # build removals list
     if npc_list is None:
         return [], []
-    for npc in npc_list:
-        removals.append(npc.coin_name)
-
-    additions.extend(additions_for_npc(npc_list))
+    # Build both lists in a single pass over the NPCs
+    append_removal = removals.append
+    extend_additions = additions.extend
+    for coin_name, condition_dict in map(_npc_name_and_conditions, npc_list):
+        append_removal(coin_name)
+        extend_additions(created_outputs_for_conditions_dict(condition_dict, coin_name))
 
     return removals, additions
@@ -1,5 +1,4 @@
 from clvm.casts import int_from_bytes
-from clvm_tools import binutils
 
 from tad.consensus.block_rewards import calculate_base_farmer_reward, calculate_pool_reward
 from tad.types.blockchain_format.program import Program
@@ -22,10 +21,10 @@ assert farmer_amounts * 2 == calculate_base_farmer_reward(uint32(0))
 
 
 def make_puzzle(amount: int) -> int:
-    puzzle = f"(q . ((51 0x{ph1.hex()} {amount}) (51 0x{ph2.hex()} {amount})))"
-    # print(puzzle)
-
-    puzzle_prog = Program.to(binutils.assemble(puzzle))
+    # (q . ((51 ph1 amount) (51 ph2 amount))), built directly instead of assembling its source text
+    puzzle_prog = Program.to(
+        (1, [[ConditionOpcode.CREATE_COIN, ph1, amount], [ConditionOpcode.CREATE_COIN, ph2, amount]])
+    )
     print("Program: ", puzzle_prog)
     puzzle_hash = puzzle_prog.get_tree_hash()
 
@@ -52,10 +51,11 @@ def make_puzzle(amount: int) -> int:
     return total_tad
 
 
-total_tad = 0
-print("Pool address: ")
-total_tad += make_puzzle(pool_amounts)
-print("\nFarmer address: ")
-total_tad += make_puzzle(farmer_amounts)
+if __name__ == "__main__":
+    total_tad = 0
+    print("Pool address: ")
+    total_tad += make_puzzle(pool_amounts)
+    print("\nFarmer address: ")
+    total_tad += make_puzzle(farmer_amounts)
 
-assert total_tad == calculate_base_farmer_reward(uint32(0)) + calculate_pool_reward(uint32(0))
+    assert total_tad == calculate_base_farmer_reward(uint32(0)) + calculate_pool_reward(uint32(0))
@@ -1,8 +1,8 @@
 from tad.types.blockchain_format.program import SerializedProgram
 
-from .load_clvm import load_clvm
+from .load_clvm import load_serialized_clvm
 
-MOD = SerializedProgram.from_bytes(load_clvm("rom_bootstrap_generator.clvm").as_bin())
+MOD: SerializedProgram = load_serialized_clvm("rom_bootstrap_generator.clvm")
 
 
 def get_generator():
@@ -29,6 +29,7 @@ class WalletBlockStore:
     db: aiosqlite.Connection
     db_wrapper: DBWrapper
     block_cache: LRUCache
+    block_record_cache: LRUCache
 
     @classmethod
     async def create(cls, db_wrapper: DBWrapper):
@@ -65,6 +66,8 @@ class WalletBlockStore:
         await self.db.execute("CREATE INDEX IF NOT EXISTS peak on block_records(is_peak)")
         await self.db.commit()
         self.block_cache = LRUCache(1000)
+        # Block records looked up by hash, e.g. when walking back to the previous transaction block
+        self.block_record_cache = LRUCache(1000)
         return self
 
     async def _clear_database(self):
@@ -87,6 +90,8 @@ class WalletBlockStore:
             # Since write to db can fail, we remove from cache here to avoid potential inconsistency
             # Adding to cache only from reading
             self.block_cache.put(header_block_record.header_hash, None)
+        if self.block_record_cache.get(header_block_record.header_hash) is not None:
+            self.block_record_cache.put(header_block_record.header_hash, None)
 
         if header_block_record.header.foliage_transaction_block is not None:
             timestamp = header_block_record.header.foliage_transaction_block.timestamp
@@ -167,6 +172,9 @@ class WalletBlockStore:
             return None
 
     async def get_block_record(self, header_hash: bytes32) -> Optional[BlockRecord]:
+        cached = self.block_record_cache.get(header_hash)
+        if cached is not None:
+            return cached
         cursor = await self.db.execute(
             "SELECT block from block_records WHERE header_hash=?",
             (header_hash.hex(),),
@@ -174,7 +182,9 @@ class WalletBlockStore:
         row = await cursor.fetchone()
         await cursor.close()
         if row is not None:
-            return BlockRecord.from_bytes(row[0])
+            block_record: BlockRecord = BlockRecord.from_bytes(row[0])
+            self.block_record_cache.put(header_hash, block_record)
+            return block_record
         return None
 
     async def get_block_records(
@@ -84,33 +84,42 @@ class WalletCoinStore:
 
     # Store CoinRecord in DB and ram cache
     async def add_coin_record(self, record: WalletCoinRecord) -> None:
-        # update wallet cache
-        name = record.name()
-        self.coin_record_cache[name] = record
-        if record.wallet_id in self.unspent_coin_wallet_cache:
-            if record.spent and name in self.unspent_coin_wallet_cache[record.wallet_id]:
-                self.unspent_coin_wallet_cache[record.wallet_id].pop(name)
-            if not record.spent:
-                self.unspent_coin_wallet_cache[record.wallet_id][name] = record
-        else:
-            if not record.spent:
-                self.unspent_coin_wallet_cache[record.wallet_id] = {}
-                self.unspent_coin_wallet_cache[record.wallet_id][name] = record
+        await self.add_coin_records([record])
+
+    # Store many CoinRecords in DB and ram cache, with a single statement
+    async def add_coin_records(self, records: List[WalletCoinRecord]) -> None:
+        rows = []
+        for record in records:
+            # update wallet cache
+            name = record.name()
+            self.coin_record_cache[name] = record
+            if record.wallet_id in self.unspent_coin_wallet_cache:
+                if record.spent and name in self.unspent_coin_wallet_cache[record.wallet_id]:
+                    self.unspent_coin_wallet_cache[record.wallet_id].pop(name)
+                if not record.spent:
+                    self.unspent_coin_wallet_cache[record.wallet_id][name] = record
+            else:
+                if not record.spent:
+                    self.unspent_coin_wallet_cache[record.wallet_id] = {}
+                    self.unspent_coin_wallet_cache[record.wallet_id][name] = record
+
+            rows.append(
+                (
+                    name.hex(),
+                    record.confirmed_block_height,
+                    record.spent_block_height,
+                    int(record.spent),
+                    int(record.coinbase),
+                    str(record.coin.puzzle_hash.hex()),
+                    str(record.coin.parent_coin_info.hex()),
+                    bytes(record.coin.amount),
+                    record.wallet_type,
+                    record.wallet_id,
+                )
+            )
 
-        cursor = await self.db_connection.execute(
-            "INSERT OR REPLACE INTO coin_record VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                name.hex(),
-                record.confirmed_block_height,
-                record.spent_block_height,
-                int(record.spent),
-                int(record.coinbase),
-                str(record.coin.puzzle_hash.hex()),
-                str(record.coin.parent_coin_info.hex()),
-                bytes(record.coin.amount),
-                record.wallet_type,
-                record.wallet_id,
-            ),
+        cursor = await self.db_connection.executemany(
+            "INSERT OR REPLACE INTO coin_record VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
         )
         await cursor.close()
 
@@ -120,7 +129,25 @@ class WalletCoinStore:
         assert current is not None
         # assert current.spent is False
 
-        spent: WalletCoinRecord = WalletCoinRecord(
+        spent: WalletCoinRecord = self._spent_record(current, height)
+
+        await self.add_coin_record(spent)
+        return spent
+
+    # Update many already fetched coin_records to be spent in DB, at the same height
+    async def set_spent_many(
+        self, current_records: Dict[bytes32, WalletCoinRecord], height: uint32
+    ) -> List[WalletCoinRecord]:
+        spent_records: List[WalletCoinRecord] = [
+            self._spent_record(current, height) for current in current_records.values()
+        ]
+
+        await self.add_coin_records(spent_records)
+        return spent_records
+
+    @staticmethod
+    def _spent_record(current: WalletCoinRecord, height: uint32) -> WalletCoinRecord:
+        return WalletCoinRecord(
             current.coin,
             current.confirmed_block_height,
             height,
@@ -130,9 +157,6 @@ class WalletCoinStore:
             current.wallet_id,
         )
 
-        await self.add_coin_record(spent)
-        return spent
-
     def coin_record_from_row(self, row: sqlite3.Row) -> WalletCoinRecord:
         coin = Coin(bytes32(bytes.fromhex(row[6])), bytes32(bytes.fromhex(row[5])), uint64.from_bytes(row[7]))
         return WalletCoinRecord(
@@ -151,6 +175,29 @@ class WalletCoinStore:
             return None
         return self.coin_record_from_row(row)
 
+    async def get_coin_records(
+        self, coin_names: List[bytes32], batch_size: int = 900
+    ) -> Dict[bytes32, WalletCoinRecord]:
+        """Returns the CoinRecords with the specified coin ids that are present, keyed by coin id."""
+        assert batch_size < 999
+        result: Dict[bytes32, WalletCoinRecord] = {}
+        missing: List[str] = []
+        for coin_name in coin_names:
+            if coin_name in self.coin_record_cache:
+                result[coin_name] = self.coin_record_cache[coin_name]
+            else:
+                missing.append(coin_name.hex())
+
+        for i in range(0, len(missing), batch_size):
+            names_db = tuple(missing[i : i + batch_size])
+            rows = await self.db_connection.execute_fetchall(
+                f'SELECT * from coin_record WHERE coin_name in ({"?," * (len(names_db) - 1)}?)', names_db
+            )
+            for row in rows:
+                record = self.coin_record_from_row(row)
+                result[record.name()] = record
+        return result
+
     async def get_first_coin_height(self) -> Optional[uint32]:
         """Returns height of first confirmed coin"""
         cursor = await self.db_connection.execute("SELECT MIN(confirmed_height) FROM coin_record;")
@@ -1,4 +1,4 @@
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import aiosqlite
 
@@ -69,6 +69,22 @@ class WalletInterestedStore:
             return None
         return row[0]
 
+    async def get_interested_puzzle_hash_wallet_ids(
+        self, puzzle_hashes: List[bytes32], batch_size: int = 900
+    ) -> Dict[bytes32, int]:
+        assert batch_size < 999
+        result: Dict[bytes32, int] = {}
+        for i in range(0, len(puzzle_hashes), batch_size):
+            puzzle_hashes_db = tuple(ph.hex() for ph in puzzle_hashes[i : i + batch_size])
+            rows = await self.db_connection.execute_fetchall(
+                f"SELECT puzzle_hash, wallet_id FROM interested_puzzle_hashes "
+                f'WHERE puzzle_hash in ({"?," * (len(puzzle_hashes_db) - 1)}?)',
+                puzzle_hashes_db,
+            )
+            for row in rows:
+                result[bytes32(bytes.fromhex(row[0]))] = row[1]
+        return result
+
     async def add_interested_puzzle_hash(
         self, puzzle_hash: bytes32, wallet_id: int, in_transaction: bool = False
     ) -> None:
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import aiosqlite
 from blspy import G1Element
@@ -85,19 +85,18 @@ class WalletPuzzleStore:
         if not in_transaction:
             await self.db_wrapper.lock.acquire()
         try:
-            sql_records = []
-            for record in records:
-                self.all_puzzle_hashes.add(record.puzzle_hash)
-                sql_records.append(
-                    (
-                        record.index,
-                        bytes(record.pubkey).hex(),
-                        record.puzzle_hash.hex(),
-                        record.wallet_type,
-                        record.wallet_id,
-                        0,
-                    ),
+            self.all_puzzle_hashes.update(record.puzzle_hash for record in records)
+            sql_records = [
+                (
+                    record.index,
+                    bytes(record.pubkey).hex(),
+                    record.puzzle_hash.hex(),
+                    record.wallet_type,
+                    record.wallet_id,
+                    0,
                 )
+                for record in records
+            ]
 
             cursor = await self.db_connection.executemany(
                 "INSERT OR REPLACE INTO derivation_paths VALUES(?, ?, ?, ?, ?, ?)",
@@ -271,21 +270,74 @@ class WalletPuzzleStore:
 
         return None
 
-    async def get_all_puzzle_hashes(self) -> Set[bytes32]:
+    async def index_for_puzzle_hashes(
+        self, puzzle_hashes: List[bytes32], batch_size: int = 900
+    ) -> Dict[bytes32, uint32]:
         """
-        Return a set containing all puzzle_hashes we generated.
+        Returns the derivation index of each of the passed puzzle_hashes that is present in the db.
         """
+        assert batch_size < 999
+        result: Dict[bytes32, uint32] = {}
+        for i in range(0, len(puzzle_hashes), batch_size):
+            puzzle_hashes_db = tuple(ph.hex() for ph in puzzle_hashes[i : i + batch_size])
+            rows = await self.db_connection.execute_fetchall(
+                f"SELECT puzzle_hash, derivation_index from derivation_paths "
+                f'WHERE puzzle_hash in ({"?," * (len(puzzle_hashes_db) - 1)}?)',
+                puzzle_hashes_db,
+            )
+            for row in rows:
+                result.setdefault(bytes32(bytes.fromhex(row[0])), uint32(row[1]))
 
-        cursor = await self.db_connection.execute("SELECT * from derivation_paths")
-        rows = await cursor.fetchall()
-        await cursor.close()
-        result: Set[bytes32] = set()
+        return result
+
+    async def wallet_info_for_puzzle_hashes(
+        self, puzzle_hashes: List[bytes32], batch_size: int = 900
+    ) -> Dict[bytes32, Tuple[uint32, WalletType]]:
+        """
+        Returns the wallet id and type of each of the passed puzzle_hashes that is present in the db.
+        """
+        assert batch_size < 999
+        result: Dict[bytes32, Tuple[uint32, WalletType]] = {}
+        for i in range(0, len(puzzle_hashes), batch_size):
+            puzzle_hashes_db = tuple(ph.hex() for ph in puzzle_hashes[i : i + batch_size])
+            rows = await self.db_connection.execute_fetchall(
+                f"SELECT puzzle_hash, wallet_id, wallet_type from derivation_paths "
+                f'WHERE puzzle_hash in ({"?," * (len(puzzle_hashes_db) - 1)}?)',
+                puzzle_hashes_db,
+            )
+            for row in rows:
+                result.setdefault(bytes32(bytes.fromhex(row[0])), (uint32(row[1]), WalletType(row[2])))
+
+        return result
 
-        for row in rows:
-            result.add(bytes32(bytes.fromhex(row[2])))
+    async def wallet_ids_for_puzzle_hashes(
+        self, puzzle_hashes: List[bytes32], batch_size: int = 900
+    ) -> Dict[bytes32, uint32]:
+        """
+        Returns the wallet id of each of the passed puzzle_hashes that is present in the db.
+        """
+        assert batch_size < 999
+        result: Dict[bytes32, uint32] = {}
+        for i in range(0, len(puzzle_hashes), batch_size):
+            puzzle_hashes_db = tuple(ph.hex() for ph in puzzle_hashes[i : i + batch_size])
+            rows = await self.db_connection.execute_fetchall(
+                f"SELECT puzzle_hash, wallet_id from derivation_paths "
+                f'WHERE puzzle_hash in ({"?," * (len(puzzle_hashes_db) - 1)}?)',
+                puzzle_hashes_db,
+            )
+            for row in rows:
+                result.setdefault(bytes32(bytes.fromhex(row[0])), uint32(row[1]))
 
         return result
 
+    async def get_all_puzzle_hashes(self) -> Set[bytes32]:
+        """
+        Return a set containing all puzzle_hashes we generated.
+        """
+
+        rows = await self.db_connection.execute_fetchall("SELECT puzzle_hash from derivation_paths")
+        return {bytes32(bytes.fromhex(row[0])) for row in rows}
+
     async def get_last_derivation_path(self) -> Optional[uint32]:
         """
         Returns the last derivation path by derivation_index.
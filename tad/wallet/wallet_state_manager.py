@@ -3,9 +3,8 @@ import base64
 import json
 import logging
 import time
-from collections import defaultdict
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import aiosqlite
 from blspy import AugSchemeMPL, G1Element, PrivateKey
@@ -33,11 +32,13 @@ from tad.util.db_wrapper import DBWrapper
 from tad.util.errors import Err
 from tad.util.hash import std_hash
 from tad.util.ints import uint32, uint64, uint128
+from tad.util.lru_cache import LRUCache
 from tad.wallet.block_record import HeaderBlockRecord
 from tad.wallet.cc_wallet.cc_wallet import CCWallet
 from tad.wallet.derivation_record import DerivationRecord
 from tad.wallet.derive_keys import master_sk_to_backup_sk, master_sk_to_wallet_sk
 from tad.wallet.key_val_store import KeyValStore
+from tad.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import puzzle_for_pk as standard_puzzle_for_pk
 from tad.wallet.rl_wallet.rl_wallet import RLWallet
 from tad.wallet.settings.user_settings import UserSettings
 from tad.wallet.trade_manager import TradeManager
@@ -62,12 +63,32 @@ from tad.wallet.wallet_user_store import WalletUserStore
 from tad.server.server import TadServer
 from tad.wallet.did_wallet.did_wallet import DIDWallet
 
+# Applied to the wallet db connection after journal_mode and synchronous, can be overridden with config["db_pragmas"]
+DEFAULT_DB_PRAGMAS: Dict[str, Union[int, str]] = {
+    "mmap_size": 268435456,  # 256 MiB
+    "cache_size": -64000,  # 64 MiB
+    "temp_store": "MEMORY",
+    "wal_autocheckpoint": 1000,
+}
+
+
+def derive_keys_and_standard_puzzle_hashes(
+    private_key: PrivateKey, start_index: int, end_index: int
+) -> List[Tuple[G1Element, bytes, bytes32]]:
+    """
+    Returns the wallet public key, its serialization and the standard wallet puzzle hash for each index in the range.
+    """
+    results: List[Tuple[G1Element, bytes, bytes32]] = []
+    for index in range(start_index, end_index):
+        pubkey = master_sk_to_wallet_sk(private_key, uint32(index)).get_g1()
+        pubkey_bytes = bytes(pubkey)
+        results.append((pubkey, pubkey_bytes, standard_puzzle_for_pk(pubkey_bytes).get_tree_hash()))
+    return results
+
 
 def get_balance_from_coin_records(coin_records: Set[WalletCoinRecord]) -> uint128:
-    amount: uint128 = uint128(0)
-    for record in coin_records:
-        amount = uint128(amount + record.coin.amount)
-    return uint128(amount)
+    # Sum plain ints and only range check the total
+    return uint128(sum(record.coin.amount for record in coin_records))
 
 
 class WalletStateManager:
@@ -90,12 +111,16 @@ class WalletStateManager:
 
     # TODO Don't allow user to send tx until wallet is synced
     sync_mode: bool
+    # The peak header hash that synced() last walked back from, and the transaction block it found
+    _last_tx_block_for_peak: Optional[Tuple[bytes32, BlockRecord]]
+    # (wallet id, rl_info, pubkey bytes) -> puzzle hash of the rate limited wallets
+    _rl_puzzle_hash_cache: LRUCache
     genesis: FullBlock
 
     state_changed_callback: Optional[Callable]
     pending_tx_callback: Optional[Callable]
-    puzzle_hash_created_callbacks: Dict = defaultdict(lambda *x: None)
-    new_peak_callbacks: Dict = defaultdict(lambda *x: None)
+    puzzle_hash_created_callbacks: Dict[bytes32, Callable]
+    new_peak_callbacks: Dict[int, Callable]
     db_path: Path
     db_connection: aiosqlite.Connection
     db_wrapper: DBWrapper
@@ -103,6 +128,8 @@ class WalletStateManager:
     main_wallet: Wallet
     wallets: Dict[uint32, Any]
     private_key: PrivateKey
+    # Public keys derived so far by get_derivation_index, in derivation order
+    _pubkey_to_index: Dict[bytes, int]
 
     trade_manager: TradeManager
     new_wallet: bool
@@ -135,10 +162,16 @@ class WalletStateManager:
         self.root_path = root_path
         self.log = logging.getLogger(name if name else __name__)
         self.lock = asyncio.Lock()
+        self.puzzle_hash_created_callbacks = {}
+        self.new_peak_callbacks = {}
+        self._last_tx_block_for_peak = None
+        self._rl_puzzle_hash_cache = LRUCache(100)
         self.log.debug(f"Starting in db path: {db_path}")
         self.db_connection = await aiosqlite.connect(db_path)
         await self.db_connection.execute("pragma journal_mode=wal")
         await self.db_connection.execute("pragma synchronous=OFF")
+        for pragma, value in {**DEFAULT_DB_PRAGMAS, **config.get("db_pragmas", {})}.items():
+            await self.db_connection.execute(f"pragma {pragma}={value}")
 
         self.db_wrapper = DBWrapper(self.db_connection)
         self.coin_store = await WalletCoinStore.create(self.db_wrapper)
@@ -176,6 +209,7 @@ class WalletStateManager:
         assert main_wallet_info is not None
 
         self.private_key = private_key
+        self._pubkey_to_index = {}
         self.main_wallet = await Wallet.create(self, main_wallet_info)
 
         self.wallets = {main_wallet_info.id: self.main_wallet}
@@ -222,9 +256,15 @@ class WalletStateManager:
         return peak
 
     def get_derivation_index(self, pubkey: G1Element, max_depth: int = 1000) -> int:
-        for i in range(0, max_depth):
-            derived = self.get_public_key(uint32(i))
-            if derived == pubkey:
+        pubkey_bytes = bytes(pubkey)
+        index = self._pubkey_to_index.get(pubkey_bytes)
+        if index is not None:
+            return index if index < max_depth else -1
+        # Only derive the keys that have not been seen yet
+        for i in range(len(self._pubkey_to_index), max_depth):
+            derived = bytes(self.get_public_key(uint32(i)))
+            self._pubkey_to_index[derived] = i
+            if derived == pubkey_bytes:
                 return i
         return -1
 
@@ -284,13 +324,11 @@ class WalletStateManager:
         else:
             to_generate = self.config["initial_num_public_keys"]
 
+        start_indexes: Dict[uint32, int] = {}
         for wallet_id in targets:
-            target_wallet = self.wallets[wallet_id]
-
             last: Optional[uint32] = await self.puzzle_store.get_last_derivation_path_for_wallet(wallet_id)
 
             start_index = 0
-            derivation_paths: List[DerivationRecord] = []
 
             if last is not None:
                 start_index = last + 1
@@ -298,11 +336,43 @@ class WalletStateManager:
             # If the key was replaced (from_zero=True), we should generate the puzzle hashes for the new key
             if from_zero:
                 start_index = 0
+            start_indexes[wallet_id] = start_index
+
+        # Wallets that use the derived keys all need the same ones: derive each index once, off the event loop.
+        # This stays in process, the master private key is never handed to other processes.
+        end_index = unused + to_generate
+        key_start_indexes = [
+            start_index
+            for wallet_id, start_index in start_indexes.items()
+            if WalletType(self.wallets[wallet_id].type()) not in (WalletType.POOLING_WALLET, WalletType.RATE_LIMITED)
+        ]
+        pubkeys: Dict[int, G1Element] = {}
+        pubkeys_bytes: Dict[int, bytes] = {}
+        standard_puzzle_hashes: Dict[int, bytes32] = {}
+        if len(key_start_indexes) > 0:
+            first_index = min(key_start_indexes)
+            derived: List[Tuple[G1Element, bytes, bytes32]] = await asyncio.get_running_loop().run_in_executor(
+                None, derive_keys_and_standard_puzzle_hashes, self.private_key, first_index, end_index
+            )
+            for index, (pubkey, pubkey_bytes, standard_puzzle_hash) in enumerate(derived, first_index):
+                pubkeys[index] = pubkey
+                pubkeys_bytes[index] = pubkey_bytes
+                standard_puzzle_hashes[index] = standard_puzzle_hash
 
-            for index in range(start_index, unused + to_generate):
-                if WalletType(target_wallet.type()) == WalletType.POOLING_WALLET:
+        # Records for every wallet are written together, in a single transaction
+        derivation_paths: List[DerivationRecord] = []
+        for wallet_id in targets:
+            target_wallet = self.wallets[wallet_id]
+            target_wallet_type = WalletType(target_wallet.type())
+            # Loop invariants for the records of this wallet
+            puzzle_for_pk = target_wallet.puzzle_for_pk
+            record_wallet_type = target_wallet.type()
+            record_wallet_id = uint32(target_wallet.id())
+
+            for index in range(start_indexes[wallet_id], end_index):
+                if target_wallet_type == WalletType.POOLING_WALLET:
                     continue
-                if WalletType(target_wallet.type()) == WalletType.RATE_LIMITED:
+                if target_wallet_type == WalletType.RATE_LIMITED:
                     if target_wallet.rl_info.initialized is False:
                         break
                     wallet_type = target_wallet.rl_info.type
@@ -310,8 +380,13 @@ class WalletStateManager:
                         rl_pubkey = G1Element.from_bytes(target_wallet.rl_info.user_pubkey)
                     else:
                         rl_pubkey = G1Element.from_bytes(target_wallet.rl_info.admin_pubkey)
-                    rl_puzzle: Program = target_wallet.puzzle_for_pk(rl_pubkey)
-                    puzzle_hash: bytes32 = rl_puzzle.get_tree_hash()
+                    # The rate limited puzzle hash only changes with the wallet's rl_info
+                    rl_cache_key = (wallet_id, target_wallet.rl_info, bytes(rl_pubkey))
+                    puzzle_hash: Optional[bytes32] = self._rl_puzzle_hash_cache.get(rl_cache_key)
+                    if puzzle_hash is None:
+                        rl_puzzle: Program = target_wallet.puzzle_for_pk(rl_pubkey)
+                        puzzle_hash = rl_puzzle.get_tree_hash()
+                        self._rl_puzzle_hash_cache.put(rl_cache_key, puzzle_hash)
 
                     rl_index = self.get_derivation_index(rl_pubkey)
                     if rl_index == -1:
@@ -328,26 +403,38 @@ class WalletStateManager:
                     )
                     break
 
-                pubkey: G1Element = self.get_public_key(uint32(index))
-                puzzle: Program = target_wallet.puzzle_for_pk(bytes(pubkey))
-                if puzzle is None:
-                    self.log.warning(f"Unable to create puzzles with wallet {target_wallet}")
-                    break
-                puzzlehash: bytes32 = puzzle.get_tree_hash()
+                pubkey: G1Element = pubkeys[index]
+                puzzlehash: bytes32
+                if target_wallet_type == WalletType.STANDARD_WALLET:
+                    # Already hashed with the derived keys
+                    puzzlehash = standard_puzzle_hashes[index]
+                else:
+                    puzzle: Program = puzzle_for_pk(pubkeys_bytes[index])
+                    if puzzle is None:
+                        self.log.warning(f"Unable to create puzzles with wallet {target_wallet}")
+                        break
+                    puzzlehash = puzzle.get_tree_hash()
                 self.log.info(f"Puzzle at index {index} wallet ID {wallet_id} puzzle hash {puzzlehash.hex()}")
                 derivation_paths.append(
                     DerivationRecord(
                         uint32(index),
                         puzzlehash,
                         pubkey,
-                        target_wallet.type(),
-                        uint32(target_wallet.id()),
+                        record_wallet_type,
+                        record_wallet_id,
                     )
                 )
 
-            await self.puzzle_store.add_derivation_paths(derivation_paths, in_transaction)
-        if unused > 0:
-            await self.puzzle_store.set_used_up_to(uint32(unused - 1), in_transaction)
+        if not in_transaction:
+            await self.db_wrapper.lock.acquire()
+        try:
+            await self.puzzle_store.add_derivation_paths(derivation_paths, True)
+            if unused > 0:
+                await self.puzzle_store.set_used_up_to(uint32(unused - 1), True)
+        finally:
+            if not in_transaction:
+                await self.db_connection.commit()
+                self.db_wrapper.lock.release()
 
     async def update_wallet_puzzle_hashes(self, wallet_id):
         derivation_paths: List[DerivationRecord] = []
@@ -360,9 +447,12 @@ class WalletStateManager:
             if unused is None:
                 # This handles the case where the database is empty
                 unused = uint32(0)
+        puzzle_for_pk = target_wallet.puzzle_for_pk
+        record_wallet_type = target_wallet.wallet_info.type
+        record_wallet_id = uint32(target_wallet.wallet_info.id)
         for index in range(unused, last):
             pubkey: G1Element = self.get_public_key(uint32(index))
-            puzzle: Program = target_wallet.puzzle_for_pk(bytes(pubkey))
+            puzzle: Program = puzzle_for_pk(bytes(pubkey))
             puzzlehash: bytes32 = puzzle.get_tree_hash()
             self.log.info(f"Generating public key at index {index} puzzle hash {puzzlehash.hex()}")
             derivation_paths.append(
@@ -370,8 +460,8 @@ class WalletStateManager:
                     uint32(index),
                     puzzlehash,
                     pubkey,
-                    target_wallet.wallet_info.type,
-                    uint32(target_wallet.wallet_info.id),
+                    record_wallet_type,
+                    record_wallet_id,
                 )
             )
         await self.puzzle_store.add_derivation_paths(derivation_paths)
@@ -387,9 +477,8 @@ class WalletStateManager:
             unused: Optional[uint32] = await self.puzzle_store.get_unused_derivation_path()
             if unused is None:
                 await self.create_more_puzzle_hashes()
-
-            # Now we must have unused public keys
-            unused = await self.puzzle_store.get_unused_derivation_path()
+                # Now we must have unused public keys
+                unused = await self.puzzle_store.get_unused_derivation_path()
             assert unused is not None
             record: Optional[DerivationRecord] = await self.puzzle_store.get_derivation_record(unused, wallet_id)
             assert record is not None
@@ -434,7 +523,7 @@ class WalletStateManager:
         self.new_peak_callbacks[wallet_id] = callback
 
     async def puzzle_hash_created(self, coin: Coin):
-        callback = self.puzzle_hash_created_callbacks[coin.puzzle_hash]
+        callback = self.puzzle_hash_created_callbacks.get(coin.puzzle_hash)
         if callback is None:
             return None
         await callback(coin)
@@ -465,11 +554,16 @@ class WalletStateManager:
         if peak is None:
             return False
 
-        curr = peak
-        while not curr.is_transaction_block and not curr.height == 0:
-            curr = self.blockchain.try_block_record(curr.prev_hash)
-            if curr is None:
-                return False
+        if self._last_tx_block_for_peak is not None and self._last_tx_block_for_peak[0] == peak.header_hash:
+            curr = self._last_tx_block_for_peak[1]
+        else:
+            curr = peak
+            while not curr.is_transaction_block and not curr.height == 0:
+                curr = self.blockchain.try_block_record(curr.prev_hash)
+                if curr is None:
+                    return False
+            # Only walk back again once the peak moves
+            self._last_tx_block_for_peak = (peak.header_hash, curr)
         if curr.is_transaction_block and curr.timestamp > int(time.time()) - 7 * 60:
             return True
         return False
@@ -488,11 +582,7 @@ class WalletStateManager:
 
         spendable: Set[WalletCoinRecord] = await self.get_spendable_coins_for_wallet(wallet_id, unspent_records)
 
-        spendable_amount: uint128 = uint128(0)
-        for record in spendable:
-            spendable_amount = uint128(spendable_amount + record.coin.amount)
-
-        return spendable_amount
+        return get_balance_from_coin_records(spendable)
 
     async def does_coin_belong_to_wallet(self, coin: Coin, wallet_id: int) -> bool:
         """
@@ -560,13 +650,20 @@ class WalletStateManager:
         removal_amount: int = 0
         addition_amount: int = 0
 
+        # Look up the owners of all the puzzle hashes at once, instead of one query per coin
+        puzzle_hashes: Set[bytes32] = set()
+        for record in unconfirmed_tx:
+            puzzle_hashes.update(coin.puzzle_hash for coin in record.removals)
+            puzzle_hashes.update(coin.puzzle_hash for coin in record.additions)
+        wallet_ids: Dict[bytes32, uint32] = await self.puzzle_store.wallet_ids_for_puzzle_hashes(list(puzzle_hashes))
+
         for record in unconfirmed_tx:
             for removal in record.removals:
-                if await self.does_coin_belong_to_wallet(removal, wallet_id):
+                if wallet_ids.get(removal.puzzle_hash) == wallet_id:
                     removal_amount += removal.amount
             for addition in record.additions:
                 # This change or a self transaction
-                if await self.does_coin_belong_to_wallet(addition, wallet_id):
+                if wallet_ids.get(addition.puzzle_hash) == wallet_id:
                     addition_amount += addition.amount
 
         result = (confirmed + addition_amount) - removal_amount
@@ -579,9 +676,12 @@ class WalletStateManager:
         """
         additions: Dict[bytes32, Coin] = {}
         unconfirmed_tx = await self.tx_store.get_unconfirmed_for_wallet(wallet_id)
+        # One lookup for every addition, instead of is_addition_relevant per coin
+        puzzle_hashes: Set[bytes32] = {coin.puzzle_hash for record in unconfirmed_tx for coin in record.additions}
+        known: Dict[bytes32, uint32] = await self.puzzle_store.wallet_ids_for_puzzle_hashes(list(puzzle_hashes))
         for record in unconfirmed_tx:
             for coin in record.additions:
-                if await self.is_addition_relevant(coin):
+                if coin.puzzle_hash in known:
                     additions[coin.name()] = coin
         return additions
 
@@ -698,11 +798,13 @@ class WalletStateManager:
             if prev.is_transaction_block:
                 break
             prev = await self.blockchain.get_block_record_from_db(prev.prev_hash)
-        wallet_ids: Set[int] = set()
-        for coin in coins:
-            info = await self.puzzle_store.wallet_info_for_puzzle_hash(coin.puzzle_hash)
-            if info is not None:
-                wallet_ids.add(info[0])
+        # Look up every coin's puzzle hash once, instead of a few queries per coin
+        puzzle_hashes: List[bytes32] = list({coin.puzzle_hash for coin in coins})
+        wallet_infos = await self.puzzle_store.wallet_info_for_puzzle_hashes(puzzle_hashes)
+        interested_wallet_ids = await self.interested_store.get_interested_puzzle_hash_wallet_ids(puzzle_hashes)
+        derivation_indexes = await self.puzzle_store.index_for_puzzle_hashes(puzzle_hashes)
+
+        wallet_ids: Set[int] = {wallet_id for wallet_id, _ in wallet_infos.values()}
 
         all_outgoing_tx: Dict[int, List[TransactionRecord]] = {}
         for wallet_id in wallet_ids:
@@ -721,7 +823,7 @@ class WalletStateManager:
             if coin.parent_coin_info in farmer_rewards:
                 is_fee_reward = True
 
-            info = await self.puzzle_store.wallet_info_for_puzzle_hash(coin.puzzle_hash)
+            info = wallet_infos.get(coin.puzzle_hash)
             if info is not None:
                 wallet_id, wallet_type = info
                 added_coin_record = await self.coin_added(
@@ -735,9 +837,7 @@ class WalletStateManager:
                 )
                 added.append(added_coin_record)
             else:
-                interested_wallet_id = await self.interested_store.get_interested_puzzle_hash_wallet_id(
-                    puzzle_hash=coin.puzzle_hash
-                )
+                interested_wallet_id = interested_wallet_ids.get(coin.puzzle_hash)
                 if interested_wallet_id is not None:
                     wallet_type = self.wallets[uint32(interested_wallet_id)].type()
                     added_coin_record = await self.coin_added(
@@ -751,7 +851,7 @@ class WalletStateManager:
                     )
                     added.append(added_coin_record)
 
-            derivation_index = await self.puzzle_store.index_for_puzzle_hash(coin.puzzle_hash)
+            derivation_index = derivation_indexes.get(coin.puzzle_hash)
             if derivation_index is not None:
                 await self.puzzle_store.set_used_up_to(derivation_index, True)
 
@@ -772,19 +872,24 @@ class WalletStateManager:
         trade_coin_removed: List[Coin] = []
         removed = []
         all_unconfirmed: List[TransactionRecord] = await self.tx_store.get_all_unconfirmed()
-        for coin in coins:
-            record = await self.coin_store.get_coin_record(coin.name())
-            if coin.name() in trade_removals:
+        # Index the unconfirmed transactions by the coins they spend, so each removed coin is a single lookup
+        unconfirmed_by_removal: Dict[bytes32, List[TransactionRecord]] = {}
+        for unconfirmed_record in all_unconfirmed:
+            for rem_coin in unconfirmed_record.removals:
+                unconfirmed_by_removal.setdefault(rem_coin.name(), []).append(unconfirmed_record)
+        coin_names: List[bytes32] = [coin.name() for coin in coins]
+        records: Dict[bytes32, WalletCoinRecord] = await self.coin_store.get_coin_records(coin_names)
+        # All the known coins are marked as spent at once
+        await self.coin_store.set_spent_many(records, height)
+        for coin, coin_name in zip(coins, coin_names):
+            record = records.get(coin_name)
+            if coin_name in trade_removals:
                 trade_coin_removed.append(coin)
             if record is None:
-                self.log.info(f"Record for removed coin {coin.name()} is None. (ephemeral)")
-            else:
-                await self.coin_store.set_spent(coin.name(), height)
-            for unconfirmed_record in all_unconfirmed:
-                for rem_coin in unconfirmed_record.removals:
-                    if rem_coin.name() == coin.name():
-                        self.log.info(f"Setting tx_id: {unconfirmed_record.name} to confirmed")
-                        await self.tx_store.set_confirmed(unconfirmed_record.name, height)
+                self.log.info(f"Record for removed coin {coin_name} is None. (ephemeral)")
+            for unconfirmed_record in unconfirmed_by_removal.get(coin_name, []):
+                self.log.info(f"Setting tx_id: {unconfirmed_record.name} to confirmed")
+                await self.tx_store.set_confirmed(unconfirmed_record.name, height)
             if record is not None:
                 removed.append(record)
 
@@ -975,36 +1080,32 @@ class WalletStateManager:
 
         my_puzzle_hashes = self.puzzle_store.all_puzzle_hashes
 
-        removals_of_interest: bytes32 = []
-        additions_of_interest: bytes32 = []
-
         (
             trade_removals,
             trade_additions,
         ) = await self.trade_manager.get_coins_of_interest()
-        for name, trade_coin in trade_removals.items():
-            if tx_filter.Match(bytearray(trade_coin.name())):
-                removals_of_interest.append(trade_coin.name())
-
-        for name, trade_coin in trade_additions.items():
-            if tx_filter.Match(bytearray(trade_coin.puzzle_hash)):
-                additions_of_interest.append(trade_coin.puzzle_hash)
-
-        for coin_name in unspent_coin_names:
-            if tx_filter.Match(bytearray(coin_name)):
-                removals_of_interest.append(coin_name)
 
-        for puzzle_hash in my_puzzle_hashes:
-            if tx_filter.Match(bytearray(puzzle_hash)):
-                additions_of_interest.append(puzzle_hash)
+        # Gather every candidate first (ordered, without duplicates), so each one is matched against the filter once
+        removal_candidates: Dict[bytes32, None] = dict.fromkeys(
+            trade_coin.name() for trade_coin in trade_removals.values()
+        )
+        removal_candidates.update(dict.fromkeys(unspent_coin_names))
+        removal_candidates.update(dict.fromkeys(await self.interested_store.get_interested_coin_ids()))
 
-        for coin_id in await self.interested_store.get_interested_coin_ids():
-            if tx_filter.Match(bytearray(coin_id)):
-                removals_of_interest.append(coin_id)
+        addition_candidates: Dict[bytes32, None] = dict.fromkeys(
+            trade_coin.puzzle_hash for trade_coin in trade_additions.values()
+        )
+        addition_candidates.update(dict.fromkeys(my_puzzle_hashes))
+        addition_candidates.update(
+            dict.fromkeys(puzzle_hash for puzzle_hash, _ in await self.interested_store.get_interested_puzzle_hashes())
+        )
 
-        for puzzle_hash, _ in await self.interested_store.get_interested_puzzle_hashes():
-            if tx_filter.Match(bytearray(puzzle_hash)):
-                additions_of_interest.append(puzzle_hash)
+        removals_of_interest: List[bytes32] = [
+            coin_id for coin_id in removal_candidates if tx_filter.Match(bytearray(coin_id))
+        ]
+        additions_of_interest: List[bytes32] = [
+            puzzle_hash for puzzle_hash in addition_candidates if tx_filter.Match(bytearray(puzzle_hash))
+        ]
 
         return additions_of_interest, removals_of_interest
 
@@ -2565,6 +2565,8 @@ class TestReorgs:
                 assert result == ReceiveBlockResult.NEW_PEAK
             assert error_code is None
         assert b.get_peak().height == 16
+        assert b.height_to_hash_range(uint32(8), uint32(16)) == [block.header_hash for block in blocks_reorg_chain[8:]]
+        assert b.height_to_hash_range(uint32(15), uint32(17)) is None
 
     @pytest.mark.asyncio
     async def test_long_reorg(self, empty_blockchain, default_10000_blocks):
@@ -31,6 +31,9 @@ class CoinStore:
     def __init__(self, reward_mask: int = 0):
         self._db: Dict[bytes32, CoinRecord] = dict()
         self._ph_index: Dict = defaultdict(list)
+        # Unspent coin ids, overall and by puzzle hash. Dicts are used as ordered sets, so iteration follows insertion
+        self._unspent: Dict[bytes32, None] = dict()
+        self._unspent_ph_index: Dict[bytes32, Dict[bytes32, None]] = defaultdict(dict)
         self._reward_mask = reward_mask
 
     def farm_coin(
@@ -68,7 +71,8 @@ class CoinStore:
         if result.error is not None:
             raise BadSpendBundleError(f"condition validation failure {Err(result.error)}")
 
-        ephemeral_db = dict(self._db)
+        # Only the coins created by this bundle are collected here, lookups fall back to the store itself
+        ephemeral_db: Dict[bytes32, CoinRecord] = dict()
         for npc in result.npc_list:
             for coin in created_outputs_for_conditions_dict(npc.condition_dict, npc.coin_name):
                 name = coin.name()
@@ -85,6 +89,8 @@ class CoinStore:
             prev_transaction_block_height = uint32(now.height)
             timestamp = uint64(now.seconds)
             coin_record = ephemeral_db.get(npc.coin_name)
+            if coin_record is None:
+                coin_record = self._db.get(npc.coin_name)
             if coin_record is None:
                 raise BadSpendBundleError(f"coin not found for id 0x{npc.coin_name.hex()}")  # noqa
             err = mempool_check_conditions_dict(
@@ -116,6 +122,8 @@ class CoinStore:
             coin_name = spent_coin.name()
             coin_record = self._db[coin_name]
             self._db[coin_name] = replace(coin_record, spent_block_index=now.height, spent=True)
+            self._unspent.pop(coin_name, None)
+            self._unspent_ph_index[spent_coin.puzzle_hash].pop(coin_name, None)
         return additions, spend_bundle.coin_spends
 
     def coins_for_puzzle_hash(self, puzzle_hash: bytes32) -> Iterator[Coin]:
@@ -128,10 +136,13 @@ class CoinStore:
         for coin_entry in self._db.values():
             yield coin_entry.coin
 
+    def unspent_coins_for_puzzle_hash(self, puzzle_hash: bytes32) -> Iterator[Coin]:
+        for coin_name in list(self._unspent_ph_index[puzzle_hash]):
+            yield self._db[coin_name].coin
+
     def all_unspent_coins(self) -> Iterator[Coin]:
-        for coin_entry in self._db.values():
-            if not coin_entry.spent:
-                yield coin_entry.coin
+        for coin_name in list(self._unspent):
+            yield self._db[coin_name].coin
 
     def _add_coin_entry(self, coin: Coin, birthday: CoinTimestamp) -> None:
         name = coin.name()
@@ -145,6 +156,8 @@ class CoinStore:
             uint64(birthday.seconds),
         )
         self._ph_index[coin.puzzle_hash].append(name)
+        self._unspent[name] = None
+        self._unspent_ph_index[coin.puzzle_hash][name] = None
 
     def coin_record(self, coin_id: bytes32) -> Optional[CoinRecord]:
         return self._db.get(coin_id)
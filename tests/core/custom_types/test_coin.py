@@ -1,6 +1,7 @@
-from tad.types.blockchain_format.coin import Coin
+from tad.types.blockchain_format.coin import Coin, hash_coin_list
 from tad.types.blockchain_format.sized_bytes import bytes32
-from tad.util.ints import uint64
+from tad.types.coin_record import CoinRecord
+from tad.util.ints import uint32, uint64
 from tad.util.hash import std_hash
 import io
 
@@ -41,3 +42,34 @@ class TestCoin:
             bytes([0, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]),
             bytes([0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]),
         )
+
+    def test_hash_coin_list(self):
+        coins = [Coin(bytes32(bytes([i]) * 32), bytes32(b"b" * 32), uint64(i)) for i in range(10)]
+        expected_order = sorted(coins, key=lambda c: c.name_str, reverse=True)
+        expected_hash = std_hash(b"".join(c.name() for c in expected_order))
+
+        assert hash_coin_list(coins) == expected_hash
+        assert coins == expected_order
+        assert hash_coin_list(list(reversed(coins))) == expected_hash
+
+    def test_coin_name_cached(self):
+        coin = Coin(bytes32(b"a" * 32), bytes32(b"b" * 32), uint64(1))
+
+        assert coin.name() == coin.get_hash()
+        assert coin.name() is coin.name()
+        # The cached name must not leak into comparison, hashing or json
+        other = Coin(bytes32(b"a" * 32), bytes32(b"b" * 32), uint64(1))
+        assert coin == other
+        assert hash(coin) == hash(other)
+        assert "_name" not in coin.to_json_dict()
+
+    def test_coin_record_name(self):
+        coin = Coin(bytes32(b"a" * 32), bytes32(b"b" * 32), uint64(1))
+        record = CoinRecord(coin, uint32(1), uint32(0), False, False, uint64(0))
+
+        assert record.name == coin.name()
+        assert record.name is record.name
+        # The cached name must not leak into serialization or comparison
+        assert record == CoinRecord(coin, uint32(1), uint32(0), False, False, uint64(0))
+        assert CoinRecord.from_bytes(bytes(record)) == record
+        assert "_name" not in record.to_json_dict()
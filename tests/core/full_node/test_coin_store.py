@@ -202,6 +202,22 @@ class TestCoinStoreWithBlocks:
                         assert record.spent
                         assert record.spent_block_index == block.height
 
+            added_in_range = await coin_store.get_added_coins_in_range(uint32(0), blocks[-1].height)
+            removed_in_range = await coin_store.get_removed_coin_names_in_range(uint32(0), blocks[-1].height)
+            assert len(removed_in_range) > 0
+            for block in blocks:
+                added_at_height = await coin_store.get_coins_added_at_height(block.height)
+                removed_at_height = await coin_store.get_coins_removed_at_height(block.height)
+                assert {r.coin for r in added_at_height if not r.coinbase} == {
+                    coin for height, coin in added_in_range if height == block.height
+                }
+                assert {r.name for r in removed_at_height} == {
+                    name for height, name in removed_in_range if height == block.height
+                }
+                assert await coin_store.get_removed_coins_by_name_at_height(block.height) == {
+                    r.name: r.coin for r in removed_at_height
+                }
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("cache_size", [0, 10, 100000])
     async def test_rollback(self, cache_size: uint32):
@@ -9,6 +9,7 @@ from tad.types.blockchain_format.coin import Coin
 from tad.types.condition_opcodes import ConditionOpcode
 from tad.types.condition_with_args import ConditionWithArgs
 from tad.types.spend_bundle import SpendBundle
+from tad.util.ints import uint32
 from tests.core.full_node.test_coin_store import DBConnection
 from tests.wallet_tools import WalletTool
 from tests.setup_nodes import bt
@@ -89,3 +90,7 @@ class TestHintStore:
         get_hint = await blockchain.hint_store.get_coin_ids(hint)
 
         assert get_hint[0] == Coin(coin_spent.name(), puzzle_hash, 1).name()
+
+        hinted_states = await blockchain.coin_store.get_coin_states_by_hints(True, [hint, 32 * b"\3"])
+        assert [state.coin for state in hinted_states] == [Coin(coin_spent.name(), puzzle_hash, 1)]
+        assert await blockchain.coin_store.get_coin_states_by_hints(True, [hint], start_height=uint32(100)) == []
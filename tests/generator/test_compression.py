@@ -11,7 +11,7 @@ from tad.full_node.bundle_tools import (
     simple_solution_generator,
     spend_bundle_to_serialized_coin_spend_entry_list,
 )
-from tad.full_node.generator import run_generator, create_generator_args
+from tad.full_node.generator import create_compressed_generator, create_generator_args, run_generator
 from tad.full_node.mempool_check_conditions import get_puzzle_and_solution_for_coin
 from tad.types.blockchain_format.program import Program, SerializedProgram, INFINITE_COST
 from tad.types.generator_types import BlockGenerator, CompressorArg, GeneratorArg
@@ -137,6 +137,17 @@ class TestCompression(TestCase):
         assert result_s is not None
         assert result_c == result_s
 
+    def test_create_compressed_generator_matches_curry(self):
+        sb: SpendBundle = make_spend_bundle(1)
+        start, end = match_standard_transaction_at_any_index(original_generator)
+        ca = CompressorArg(uint32(0), SerializedProgram.from_bytes(original_generator), start, end)
+        cse_list = compressed_coin_spend_entry_list(sb)
+        generator = create_compressed_generator(ca, cse_list)
+        expected = DECOMPRESS_BLOCK.curry(
+            DECOMPRESS_PUZZLE, DECOMPRESS_CSE_WITH_PREFIX, Program.to(start), Program.to(end), cse_list
+        )
+        assert bytes(generator.program) == bytes(expected)
+
     def test_get_removals_for_single_coin(self):
         sb: SpendBundle = make_spend_bundle(1)
         start, end = match_standard_transaction_at_any_index(original_generator)
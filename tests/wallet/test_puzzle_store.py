@@ -58,6 +58,7 @@ class TestPuzzleStore:
             assert await db.index_for_pubkey(derivation_recs[0].pubkey) is None
             assert await db.index_for_puzzle_hash(derivation_recs[2].puzzle_hash) is None
             assert await db.wallet_info_for_puzzle_hash(derivation_recs[2].puzzle_hash) is None
+            assert await db.wallet_ids_for_puzzle_hashes([derivation_recs[2].puzzle_hash]) == {}
             assert len((await db.get_all_puzzle_hashes())) == 0
             assert await db.get_last_derivation_path() is None
             assert await db.get_unused_derivation_path() is None
@@ -84,6 +85,14 @@ class TestPuzzleStore:
                 derivation_recs[2].wallet_id,
                 derivation_recs[2].wallet_type,
             )
+            wallet_ids = await db.wallet_ids_for_puzzle_hashes([r.puzzle_hash for r in derivation_recs] + phs_4)
+            assert wallet_ids == {r.puzzle_hash: r.wallet_id for r in derivation_recs}
+            wallet_infos = await db.wallet_info_for_puzzle_hashes([derivation_recs[2].puzzle_hash] + phs_4)
+            assert wallet_infos == {
+                derivation_recs[2].puzzle_hash: (derivation_recs[2].wallet_id, derivation_recs[2].wallet_type)
+            }
+            indexes = await db.index_for_puzzle_hashes([r.puzzle_hash for r in derivation_recs] + phs_4)
+            assert indexes == {r.puzzle_hash: r.index for r in derivation_recs}
             assert len((await db.get_all_puzzle_hashes())) == 2000
             assert await db.get_last_derivation_path() == 999
             assert await db.get_unused_derivation_path() == 0
@@ -50,6 +50,10 @@ class TestWalletInterestedStore:
             assert len(await store.get_interested_puzzle_hashes()) == 1
 
             assert (await store.get_interested_puzzle_hash_wallet_id(puzzle_hash)) == 3
+            other_puzzle_hash = token_bytes(32)
+            assert (await store.get_interested_puzzle_hash_wallet_ids([puzzle_hash, other_puzzle_hash])) == {
+                puzzle_hash: 3
+            }
             await store.remove_interested_puzzle_hash(puzzle_hash)
             assert (await store.get_interested_puzzle_hash_wallet_id(puzzle_hash)) is None
             assert len(await store.get_interested_puzzle_hashes()) == 0